@@ -1,7 +1,14 @@
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, jsonify, request, send_file, url_for
+from config import Config
 from services.lesson_service import lesson_service
+from services.admission import admission_controller
+from services.audio_service import audio_service
 
 api_bp = Blueprint('api', __name__)
+admission_controller.init_blueprint(api_bp)
+
+# Hex digits of the audio SHA-256 used as the version in audio URLs
+AUDIO_VERSION_LENGTH = 16
 
 @api_bp.route('/lessons', methods=['GET'])
 def get_lessons():
@@ -39,6 +46,58 @@ def get_lesson(lesson_id):
             "error": str(e)
         }), 500
 
+@api_bp.route('/lessons/<lesson_id>/audio-manifest', methods=['GET'])
+def get_lesson_audio_manifest(lesson_id):
+    """List every audio file used by a lesson so clients can prefetch them in one batch"""
+    try:
+        lesson = lesson_service.get_lesson_by_id(lesson_id)
+        if not lesson:
+            return jsonify({
+                "success": False,
+                "error": "Lesson not found"
+            }), 404
+        
+        manifest = audio_service.get_lesson_manifest(lesson)
+        for entry in manifest["files"]:
+            # Versioned URL, so the immutable cache headers stay correct when a file changes
+            entry["url"] = url_for('api.get_audio', filename=entry["filename"], v=entry["sha256"][:AUDIO_VERSION_LENGTH])
+        
+        return jsonify({
+            "success": True,
+            "data": manifest
+        })
+    except Exception as e:
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 500
+
+@api_bp.route('/audio/<path:filename>', methods=['GET'])
+def get_audio(filename):
+    """Serve a vocabulary audio file with Range support and strong ETags"""
+    info = audio_service.get_file_info(filename)
+    if not info:
+        return jsonify({
+            "success": False,
+            "error": "Audio file not found"
+        }), 404
+    
+    # Only a URL versioned with the current digest may be cached forever;
+    # plain URLs must revalidate with the ETag in case the file is replaced
+    versioned = request.args.get('v') == info["sha256"][:AUDIO_VERSION_LENGTH]
+    
+    # send_file hands the open file to the WSGI server's file_wrapper, which
+    # servers such as gunicorn implement with sendfile; conditional=True
+    # answers Range and If-None-Match requests
+    response = send_file(info["path"], conditional=True, etag=info["sha256"],
+                         max_age=Config.AUDIO_MAX_AGE if versioned else None)
+    response.cache_control.public = True
+    if versioned:
+        response.cache_control.immutable = True
+    else:
+        response.cache_control.no_cache = True
+    return response
+
 @api_bp.route('/exercises/<exercise_id>/attempt', methods=['POST'])
 def submit_exercise_attempt(exercise_id):
     """Submit an answer for an exercise and get feedback"""
@@ -83,6 +142,95 @@ def submit_exercise_attempt(exercise_id):
             }
         })
         
+    except Exception as e:
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 500
+
+@api_bp.route('/quiz', methods=['GET'])
+def get_quiz():
+    """Generate a randomized multiple choice quiz from the vocabulary of a level"""
+    # Imported on first use so NumPy stays off the startup path
+    from services.quiz_service import quiz_service
+    try:
+        level = request.args.get('level')
+        category = request.args.get('category')
+        n = request.args.get('n', 10, type=int)
+        
+        if not level:
+            return jsonify({
+                "success": False,
+                "error": "level is required"
+            }), 400
+        
+        result = quiz_service.generate_quiz(level, n, category)
+        
+        if not result.get("valid"):
+            return jsonify({
+                "success": False,
+                "error": result.get("error", "Invalid quiz request")
+            }), 400
+        
+        return jsonify({
+            "success": True,
+            "data": {
+                "token": result["token"],
+                "level": result["level"],
+                "category": result["category"],
+                "exercises": result["exercises"]
+            }
+        })
+    except Exception as e:
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 500
+
+@api_bp.route('/quiz/<token>/attempt', methods=['POST'])
+def submit_quiz_attempt(token):
+    """Submit an answer for a generated quiz question and get feedback"""
+    from services.quiz_service import quiz_service
+    try:
+        if not request.is_json:
+            return jsonify({
+                "success": False,
+                "error": "Content-Type must be application/json"
+            }), 400
+        
+        data = request.get_json()
+        if not data:
+            return jsonify({
+                "success": False,
+                "error": "No data provided"
+            }), 400
+        
+        exercise_id = data.get('exercise_id')
+        user_answer = data.get('answer')
+        
+        if not exercise_id or user_answer is None:
+            return jsonify({
+                "success": False,
+                "error": "exercise_id and answer are required"
+            }), 400
+        
+        result = quiz_service.validate_quiz_answer(token, exercise_id, user_answer)
+        
+        if not result.get("valid"):
+            return jsonify({
+                "success": False,
+                "error": result.get("error", "Invalid exercise")
+            }), 400
+        
+        return jsonify({
+            "success": True,
+            "data": {
+                "correct": result["correct"],
+                "explanation": result["explanation"],
+                "correct_answer": result["correct_answer"]
+            }
+        })
+        
     except Exception as e:
         return jsonify({
             "success": False,
@@ -1,24 +1,51 @@
 from flask import Flask, render_template, jsonify, request
 from flask_cors import CORS
+from werkzeug.middleware.proxy_fix import ProxyFix
 import os
 import json
 from datetime import datetime
+from config import Config
+from services.startup import StartupTimer, warm_up
 
-def create_app():
+def create_app(warmup=None):
+    timer = StartupTimer()
     app = Flask(__name__)
     app.config['SECRET_KEY'] = 'dev-secret-key'
     CORS(app)
     
-    # Register learning blueprint
-    from learning import learning_bp
-    app.register_blueprint(learning_bp, url_prefix='/learning')
+    # Outside debug mode the app logger would inherit WARNING and drop the startup report
+    app.logger.setLevel(Config.LOG_LEVEL)
     
-    # Register API blueprint
-    from api import api_bp
-    app.register_blueprint(api_bp, url_prefix='/api')
+    # Take the client address from X-Forwarded-For set by our own proxies
+    if Config.TRUSTED_PROXY_COUNT:
+        app.wsgi_app = ProxyFix(app.wsgi_app, x_for=Config.TRUSTED_PROXY_COUNT,
+                                x_proto=Config.TRUSTED_PROXY_COUNT)
+    
+    # Import blueprints; this is where their services are first imported
+    with timer.phase('import learning'):
+        from learning import learning_bp
+    with timer.phase('import api'):
+        from api import api_bp
+    
+    # Register learning and API blueprints
+    with timer.phase('register blueprints'):
+        app.register_blueprint(learning_bp, url_prefix='/learning')
+        app.register_blueprint(api_bp, url_prefix='/api')
+    
+    # Register content management commands
+    from commands import content_cli, startup_report_command
+    app.cli.add_command(content_cli)
+    app.cli.add_command(startup_report_command)
     
     @app.route('/')
     def index():
         return render_template('index.html')
     
+    strategy = warmup or Config.WARMUP_STRATEGY
+    with timer.phase(f'warmup ({strategy})'):
+        warm_up(strategy)
+    
+    app.extensions['startup_timer'] = timer
+    app.logger.info(timer.summary())
+    
     return app
\ No newline at end of file
@@ -0,0 +1,209 @@
+"""
+Asyncio-native variant of the JSON API, served by an ASGI server:
+
+    uvicorn asgi:app
+
+Routes and response shapes match the /api blueprint. Content is served
+from an in-memory snapshot and attempts are recorded through an async
+queue, so one process can hold many concurrent keep-alive connections.
+"""
+
+import re
+import json
+import asyncio
+from typing import Any, Dict, List, Optional, Tuple
+
+from config import Config
+from services.lesson_service import lesson_service
+from services.async_lesson_service import AsyncLessonService, AttemptRecorder
+
+MAX_BODY_SIZE = 64 * 1024
+
+# Methods flask-cors allows by default, so preflights get the same answer as from the Flask API
+CORS_ALLOW_METHODS = b"DELETE, GET, HEAD, OPTIONS, PATCH, POST, PUT"
+
+class AsyncApiApp:
+    def __init__(self, service: AsyncLessonService, recorder: AttemptRecorder,
+                 refresh_interval: float = Config.ASYNC_SNAPSHOT_REFRESH):
+        self.service = service
+        self.recorder = recorder
+        self.refresh_interval = refresh_interval
+        self.routes = [
+            ('GET', re.compile(r'^/api/lessons$'), self.get_lessons),
+            ('GET', re.compile(r'^/api/lessons/(?P<lesson_id>[^/]+)$'), self.get_lesson),
+            ('POST', re.compile(r'^/api/exercises/(?P<exercise_id>[^/]+)/attempt$'), self.submit_exercise_attempt),
+        ]
+        self._started = False
+        self._start_lock: Optional[asyncio.Lock] = None
+        self._refresh_task: Optional[asyncio.Task] = None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+        elif scope["type"] == "http":
+            await self._ensure_started()
+            await self._handle_http(scope, receive, send)
+
+    async def startup(self) -> None:
+        await self.service.load_snapshot()
+        self.recorder.start()
+        if self.refresh_interval > 0:
+            self._refresh_task = asyncio.create_task(self._refresh_loop())
+        self._started = True
+
+    async def shutdown(self) -> None:
+        if self._refresh_task:
+            self._refresh_task.cancel()
+            self._refresh_task = None
+        await self.recorder.stop()
+        self._started = False
+
+    async def _ensure_started(self) -> None:
+        # Servers without lifespan support start the app on the first request
+        if self._started:
+            return
+        if self._start_lock is None:
+            self._start_lock = asyncio.Lock()
+        async with self._start_lock:
+            if not self._started:
+                await self.startup()
+
+    async def _lifespan(self, receive, send) -> None:
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                try:
+                    await self.startup()
+                except Exception as e:
+                    await send({"type": "lifespan.startup.failed", "message": str(e)})
+                    return
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await self.shutdown()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    async def _refresh_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.refresh_interval)
+            try:
+                await self.service.refresh_if_changed()
+            except Exception:
+                # Keep serving the previous snapshot
+                pass
+
+    async def _handle_http(self, scope, receive, send) -> None:
+        headers = self._cors_headers(scope)
+        matches = [(method, pattern.match(scope["path"]), handler) for method, pattern, handler in self.routes]
+        matches = [(method, match, handler) for method, match, handler in matches if match]
+
+        if not matches:
+            status, payload = 404, {"success": False, "error": "Not found"}
+        elif scope["method"] == "OPTIONS":
+            # CORS preflight: empty 200 listing the route's methods, like the Flask API
+            allow = ", ".join([method for method, _, _ in matches] + ["OPTIONS"])
+            await self._send(send, 200, b"", headers + [(b"allow", allow.encode())])
+            return
+        else:
+            status, payload = 405, {"success": False, "error": "Method not allowed"}
+            for method, match, handler in matches:
+                if scope["method"] != method:
+                    continue
+                try:
+                    status, payload = await handler(scope, receive, **match.groupdict())
+                except Exception as e:
+                    status, payload = 500, {"success": False, "error": str(e)}
+                break
+        await self._send_json(send, status, payload, headers)
+
+    def _cors_headers(self, scope) -> List[Tuple[bytes, bytes]]:
+        """CORS response headers matching flask-cors defaults: echo the Origin, else allow any origin"""
+        request_headers = dict(scope["headers"])
+        origin = request_headers.get(b"origin")
+        headers = [(b"access-control-allow-origin", origin or b"*")]
+        if origin:
+            headers.append((b"vary", b"Origin"))
+        if scope["method"] == "OPTIONS" and b"access-control-request-method" in request_headers:
+            headers.append((b"access-control-allow-methods", CORS_ALLOW_METHODS))
+            if b"access-control-request-headers" in request_headers:
+                headers.append((b"access-control-allow-headers", request_headers[b"access-control-request-headers"]))
+        return headers
+
+    async def get_lessons(self, scope, receive) -> Tuple[int, Dict[str, Any]]:
+        """Get list of all available lessons"""
+        lessons = await self.service.get_lessons_list()
+        return 200, {"success": True, "data": lessons}
+
+    async def get_lesson(self, scope, receive, lesson_id) -> Tuple[int, Dict[str, Any]]:
+        """Get detailed information about a specific lesson"""
+        lesson = await self.service.get_lesson_by_id(lesson_id)
+        if not lesson:
+            return 404, {"success": False, "error": "Lesson not found"}
+        return 200, {"success": True, "data": lesson}
+
+    async def submit_exercise_attempt(self, scope, receive, exercise_id) -> Tuple[int, Dict[str, Any]]:
+        """Submit an answer for an exercise and get feedback"""
+        content_type = dict(scope["headers"]).get(b"content-type", b"")
+        if not content_type.startswith(b"application/json"):
+            return 400, {"success": False, "error": "Content-Type must be application/json"}
+
+        body = await self._read_body(receive)
+        if body is None:
+            return 413, {"success": False, "error": "Request body too large"}
+        try:
+            data = json.loads(body) if body else None
+        except ValueError:
+            return 400, {"success": False, "error": "Invalid JSON"}
+        if not data or not isinstance(data, dict):
+            return 400, {"success": False, "error": "No data provided"}
+
+        lesson_id = data.get('lesson_id')
+        user_answer = data.get('answer')
+        if not lesson_id or user_answer is None:
+            return 400, {"success": False, "error": "lesson_id and answer are required"}
+
+        result = await self.service.validate_exercise_answer(lesson_id, exercise_id, user_answer)
+        if not result.get("valid"):
+            return 400, {"success": False, "error": result.get("error", "Invalid exercise")}
+
+        self.recorder.record(lesson_id, exercise_id, result["correct"])
+        return 200, {
+            "success": True,
+            "data": {
+                "correct": result["correct"],
+                "explanation": result["explanation"],
+                "correct_answer": result["correct_answer"]
+            }
+        }
+
+    async def _read_body(self, receive) -> Optional[bytes]:
+        body = b""
+        while True:
+            message = await receive()
+            body += message.get("body", b"")
+            if len(body) > MAX_BODY_SIZE:
+                return None
+            if not message.get("more_body", False):
+                return body
+
+    async def _send_json(self, send, status: int, payload: Dict[str, Any],
+                         headers: List[Tuple[bytes, bytes]]) -> None:
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        await self._send(send, status, body, [(b"content-type", b"application/json")] + headers)
+
+    async def _send(self, send, status: int, body: bytes, headers: List[Tuple[bytes, bytes]]) -> None:
+        await send({
+            "type": "http.response.start",
+            "status": status,
+            "headers": headers + [(b"content-length", str(len(body)).encode())],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+def create_asgi_app(service: Optional[AsyncLessonService] = None,
+                    recorder: Optional[AttemptRecorder] = None) -> AsyncApiApp:
+    return AsyncApiApp(
+        service or AsyncLessonService(lesson_service),
+        recorder or AttemptRecorder(Config.ATTEMPTS_LOG, max_queue=Config.ATTEMPT_QUEUE_SIZE),
+    )
+
+app = create_asgi_app()
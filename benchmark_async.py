@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Side-by-side benchmark of the WSGI API (Flask under gunicorn) and the ASGI API (under uvicorn)
+
+Each app runs in its own server process and is called over local sockets:
+the WSGI app under gunicorn's threaded worker, as it would be deployed, and
+the ASGI app under uvicorn. Every simulated client holds one keep-alive
+connection and sends its requests back to back, identified to admission
+control by an X-Client-Id header. Both servers get one worker process.
+Read and grading latencies are reported separately, so a high write ratio
+shows whether reads keep their latency while grading is saturated.
+
+    python benchmark_async.py --clients 1000 --requests 20000 --threads 32
+    python benchmark_async.py --clients 300 --write-ratio 0.5
+"""
+
+import sys
+import os
+import json
+import time
+import random
+import socket
+import asyncio
+import argparse
+import subprocess
+from collections import Counter
+
+PROJECT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+ATTEMPT = {"lesson_id": "lesson-1", "answer": "0"}
+
+CLIENT_ID_HEADER = "X-Client-Id"
+
+def build_requests(count, write_ratio, seed=0):
+    rng = random.Random(seed)
+    requests = []
+    for _ in range(count):
+        if rng.random() < write_ratio:
+            requests.append(("POST", "/api/exercises/ex-1-1/attempt", ATTEMPT))
+        elif rng.random() < 0.5:
+            requests.append(("GET", "/api/lessons", None))
+        else:
+            requests.append(("GET", "/api/lessons/lesson-1", None))
+    return requests
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+def wsgi_command(port, clients, threads):
+    return [sys.executable, "-m", "gunicorn", "app:create_app()",
+            "--bind", f"127.0.0.1:{port}", "--workers", "1",
+            "--worker-class", "gthread", "--threads", str(threads),
+            "--worker-connections", str(clients + 100), "--keep-alive", "75",
+            "--log-level", "warning"]
+
+def asgi_command(port, clients, threads):
+    return [sys.executable, "-m", "uvicorn", "asgi:app",
+            "--host", "127.0.0.1", "--port", str(port),
+            "--timeout-keep-alive", "75", "--no-access-log", "--log-level", "warning"]
+
+class Connection:
+    """One keep-alive HTTP/1.1 connection"""
+
+    def __init__(self, port, client_id):
+        self.port = port
+        self.client_id = client_id
+        self.reader = self.writer = None
+
+    async def request(self, method, path, body):
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection("127.0.0.1", self.port)
+
+        payload = json.dumps(body).encode() if body is not None else b""
+        head = (f"{method} {path} HTTP/1.1\r\nHost: 127.0.0.1\r\n"
+                f"{CLIENT_ID_HEADER}: {self.client_id}\r\n"
+                f"Content-Type: application/json\r\nContent-Length: {len(payload)}\r\n\r\n")
+        self.writer.write(head.encode() + payload)
+
+        status = int((await self.reader.readline()).split()[1])
+        headers = {}
+        while True:
+            line = await self.reader.readline()
+            if line in (b"\r\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        await self.reader.readexactly(int(headers["content-length"]))
+
+        if headers.get("connection", "").lower() == "close":
+            self.close()
+        return status
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            self.reader = self.writer = None
+
+async def drive(port, clients, requests):
+    """Run the requests from concurrent keep-alive clients, returning latencies by method and status codes"""
+    latencies, statuses = {"GET": [], "POST": []}, Counter()
+    per_client = [requests[i::clients] for i in range(clients)]
+
+    async def run_client(client, own_requests):
+        connection = Connection(port, f"client-{client}")
+        try:
+            for method, path, body in own_requests:
+                start = time.perf_counter()
+                status = await connection.request(method, path, body)
+                latencies[method].append(time.perf_counter() - start)
+                statuses[status] += 1
+        finally:
+            connection.close()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(run_client(c, r) for c, r in enumerate(per_client)))
+    return time.perf_counter() - start, latencies, statuses
+
+async def wait_until_ready(port, server, timeout=30.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"server exited with code {server.returncode}")
+        connection = Connection(port, "warmup")
+        try:
+            if await connection.request("GET", "/api/lessons", None) == 200:
+                return
+        except OSError:
+            await asyncio.sleep(0.1)
+        finally:
+            connection.close()
+    raise RuntimeError("server did not start in time")
+
+def bench(command, clients, requests, threads):
+    port = free_port()
+    # Size the grading limits for the server's thread pool
+    env = dict(os.environ, ADMISSION_CLIENT_ID_HEADER=CLIENT_ID_HEADER, WORKER_THREADS=str(threads),
+               LOG_LEVEL="WARNING")
+    server = subprocess.Popen(command(port, clients, threads), cwd=PROJECT_DIR, env=env)
+
+    async def main():
+        await wait_until_ready(port, server)
+        return await drive(port, clients, requests)
+
+    try:
+        return asyncio.run(main())
+    finally:
+        server.terminate()
+        server.wait()
+
+def percentile(latencies, fraction):
+    if not latencies:
+        return float("nan")
+    latencies = sorted(latencies)
+    return latencies[min(len(latencies) - 1, int(len(latencies) * fraction))] * 1000
+
+def report(name, elapsed, latencies, statuses):
+    reads, grading = latencies["GET"], latencies["POST"]
+    combined = reads + grading
+    codes = ", ".join(f"{code}: {count}" for code, count in sorted(statuses.items()))
+    print(f"{name:<6} {len(combined) / elapsed:>10.0f} {percentile(combined, 0.5):>9.2f} "
+          f"{percentile(reads, 0.99):>12.2f} {percentile(grading, 0.99):>12.2f}   {codes}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--clients", type=int, default=1000, help="concurrent keep-alive connections")
+    parser.add_argument("--requests", type=int, default=20000, help="total requests")
+    parser.add_argument("--threads", type=int, default=32, help="gunicorn worker threads")
+    parser.add_argument("--write-ratio", type=float, default=0.2, help="share of grading requests")
+    args = parser.parse_args()
+
+    requests = build_requests(args.requests, args.write_ratio)
+    print(f"{args.requests} requests from {args.clients} clients, {args.write_ratio:.0%} grading, "
+          f"{args.threads} gunicorn threads\n")
+    print(f"{'server':<6} {'req/s':>10} {'p50 ms':>9} {'read p99':>12} {'grading p99':>12}   status codes")
+    report("wsgi", *bench(wsgi_command, args.clients, requests, args.threads))
+    report("asgi", *bench(asgi_command, args.clients, requests, args.threads))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Startup benchmark: import time, create_app phases and time to first response per warmup strategy
+
+Every sample runs in a fresh interpreter. Timing runs do not use
+`-X importtime`, which slows imports down; the slowest module imports are
+collected in one extra run with it.
+
+    python benchmark_startup.py --strategy lazy --strategy eager-everything --runs 5
+"""
+
+import sys
+import os
+import json
+import time
+import argparse
+import statistics
+import subprocess
+from typing import Dict, List, Optional, Any, Tuple
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from services.startup import WARMUP_STRATEGIES
+
+PROJECT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+DEFAULT_PATHS = ['/api/lessons', '/api/quiz?level=beginner&n=10']
+
+def measure_startup(strategy: str, paths: List[str]) -> Dict[str, Any]:
+    """Create the app and time the first request to each path; run in a fresh process"""
+    start = time.perf_counter()
+    from app import create_app
+    imported = time.perf_counter()
+    app = create_app(warmup=strategy)
+    created = time.perf_counter()
+
+    client = app.test_client()
+    requests = []
+    for path in paths:
+        request_start = time.perf_counter()
+        response = client.get(path)
+        done = time.perf_counter()
+        requests.append({
+            "path": path,
+            "status": response.status_code,
+            "request_ms": (done - request_start) * 1000,
+            "ready_at": time.time() - (time.perf_counter() - done)
+        })
+
+    return {
+        "strategy": strategy,
+        "import_ms": (imported - start) * 1000,
+        "create_app_ms": (created - imported) * 1000,
+        "phases": app.extensions["startup_timer"].phases,
+        "requests": requests
+    }
+
+def run_startup_benchmark(strategies: List[str], paths: List[str], runs: int = 3) -> Dict[str, Any]:
+    """Measure each strategy in fresh interpreters; times are medians over the runs"""
+    results = {}
+    for strategy in strategies:
+        samples = []
+        for _ in range(runs):
+            spawned = time.time()
+            sample, _ = _run_child(strategy, paths)
+            for request in sample["requests"]:
+                request["time_to_response_ms"] = (request.pop("ready_at") - spawned) * 1000
+            samples.append(sample)
+        results[strategy] = _median_sample(samples)
+
+    # A separate run, so the importtime overhead stays out of the timings above
+    _, import_times = _run_child(strategies[0], paths, importtime=True)
+    return {"strategies": results, "imports": import_times}
+
+def format_report(report: Dict[str, Any], imports: int = 15) -> List[str]:
+    lines = ["Slowest module imports (cumulative):"]
+    for name, microseconds in report["imports"][:imports]:
+        lines.append(f"  {microseconds / 1000:8.1f} ms  {name}")
+
+    for strategy, result in report["strategies"].items():
+        lines.append(f"\n{strategy}:")
+        lines.append(f"  import app          {result['import_ms']:8.1f} ms")
+        lines.append(f"  create_app          {result['create_app_ms']:8.1f} ms")
+        for name, ms in result["phases"]:
+            lines.append(f"    {name:<30} {ms:8.1f} ms")
+        for request in result["requests"]:
+            lines.append(f"  GET {request['path']}: {request['status']} in {request['request_ms']:.1f} ms, "
+                         f"{request['time_to_response_ms']:.1f} ms after process start")
+    return lines
+
+def _run_child(strategy: str, paths: List[str],
+               importtime: bool = False) -> Tuple[Dict[str, Any], List[Tuple[str, int]]]:
+    command = [sys.executable]
+    if importtime:
+        command += ["-X", "importtime"]
+    command += [os.path.join(PROJECT_DIR, "benchmark_startup.py"), "--child", "--strategy", strategy]
+    for path in paths:
+        command += ["--path", path]
+    completed = subprocess.run(command, cwd=PROJECT_DIR, capture_output=True, text=True, check=True)
+    sample = json.loads(completed.stdout.strip().splitlines()[-1])
+    return sample, parse_importtime(completed.stderr) if importtime else []
+
+def _median_sample(samples: List[Dict[str, Any]]) -> Dict[str, Any]:
+    median = statistics.median
+    result = dict(samples[0])
+    result["import_ms"] = median([s["import_ms"] for s in samples])
+    result["create_app_ms"] = median([s["create_app_ms"] for s in samples])
+    result["phases"] = [
+        (name, median([s["phases"][i][1] for s in samples])) for i, (name, _) in enumerate(samples[0]["phases"])
+    ]
+    result["requests"] = [
+        {
+            **request,
+            "request_ms": median([s["requests"][i]["request_ms"] for s in samples]),
+            "time_to_response_ms": median([s["requests"][i]["time_to_response_ms"] for s in samples]),
+            "status": max(s["requests"][i]["status"] for s in samples)
+        }
+        for i, request in enumerate(samples[0]["requests"])
+    ]
+    return result
+
+def parse_importtime(output: str) -> List[Tuple[str, int]]:
+    """Parse `python -X importtime` output into (module, cumulative microseconds), slowest first"""
+    modules = []
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        modules.append((name.strip(), int(cumulative)))
+    return sorted(modules, key=lambda module: module[1], reverse=True)
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--strategy", dest="strategies", action="append", choices=WARMUP_STRATEGIES,
+                        help="warmup strategy to measure (repeatable, defaults to all)")
+    parser.add_argument("--path", dest="paths", action="append",
+                        help="path to request after startup (repeatable)")
+    parser.add_argument("--runs", type=int, default=3, help="fresh processes per strategy; times are medians")
+    parser.add_argument("--imports", type=int, default=15, help="number of slowest module imports to list")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    paths = args.paths or DEFAULT_PATHS
+    if args.child:
+        # Measure this process and hand the sample back to the parent as JSON
+        print(json.dumps(measure_startup(args.strategies[0], paths)))
+        return
+
+    report = run_startup_benchmark(args.strategies or list(WARMUP_STRATEGIES), paths, args.runs)
+    print("\n".join(format_report(report, args.imports)))
+
+if __name__ == "__main__":
+    main()
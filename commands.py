@@ -0,0 +1,56 @@
+import click
+from flask.cli import AppGroup
+from services.lesson_service import lesson_service
+from services.ingest_service import IngestService
+from services.startup import WARMUP_STRATEGIES
+
+content_cli = AppGroup('content', help='Validate and ingest lesson content.')
+
+def _print_report(report):
+    for error in report["errors"]:
+        click.echo(f"error: {error}", err=True)
+    click.echo(f"Checked {report['checked']} lesson(s), {len(report['errors'])} error(s)")
+
+@content_cli.command('validate')
+@click.option('--content-dir', default=None, help='Content directory (defaults to the app content directory).')
+@click.option('--workers', type=int, default=None, help='Worker processes (defaults to the number of cores).')
+def validate_command(content_dir, workers):
+    """Validate lesson files and check that they agree with curriculum.json."""
+    report = IngestService(content_dir or lesson_service.content_dir, workers).validate()
+    _print_report(report)
+    if report["errors"]:
+        raise SystemExit(1)
+
+@content_cli.command('ingest')
+@click.argument('paths', nargs=-1, required=True, type=click.Path(exists=True))
+@click.option('--content-dir', default=None, help='Content directory (defaults to the app content directory).')
+@click.option('--workers', type=int, default=None, help='Worker processes (defaults to the number of cores).')
+@click.option('--dry-run', is_flag=True, help='Validate only, do not write anything.')
+def ingest_command(paths, content_dir, workers, dry_run):
+    """Ingest lesson JSON files, directories of them, or CSV/TSV vocabulary dumps.
+
+    Nothing is written unless every lesson is valid. Lessons are written
+    atomically and curriculum.json is regenerated from the lesson files.
+    """
+    report = IngestService(content_dir or lesson_service.content_dir, workers).ingest(list(paths), dry_run=dry_run)
+    _print_report(report)
+    if report["errors"]:
+        raise SystemExit(1)
+    if not dry_run:
+        click.echo(f"Wrote {len(report['written'])} lesson(s), curriculum lists {report['curriculum_lessons']}")
+
+@click.command('startup-report')
+@click.option('--strategy', 'strategies', multiple=True, type=click.Choice(WARMUP_STRATEGIES),
+              help='Warmup strategy to measure (repeatable, defaults to all).')
+@click.option('--path', 'paths', multiple=True,
+              help='Path to request after startup (repeatable, defaults to /api/lessons and a quiz).')
+@click.option('--runs', type=int, default=3, help='Fresh processes per strategy; times are medians.')
+@click.option('--imports', type=int, default=15, help='Number of slowest module imports to list.')
+def startup_report_command(strategies, paths, runs, imports):
+    """Report import and startup times and time to first successful request per warmup strategy."""
+    # The benchmark harness lives next to the app and is only imported when the command runs
+    from benchmark_startup import DEFAULT_PATHS, format_report, run_startup_benchmark
+    report = run_startup_benchmark(list(strategies) or list(WARMUP_STRATEGIES),
+                                   list(paths) or DEFAULT_PATHS, runs)
+    for line in format_report(report, imports):
+        click.echo(line)
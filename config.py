@@ -3,6 +3,35 @@ import os
 class Config:
     SECRET_KEY = os.environ.get('SECRET_KEY') or 'dev-secret-key-change-in-production'
     CONTENT_DIR = os.environ.get('CONTENT_DIR') or 'content'
+    AUDIO_DIR = os.environ.get('AUDIO_DIR') or 'audio'  # Relative to CONTENT_DIR
+    AUDIO_MAX_AGE = int(os.environ.get('AUDIO_MAX_AGE') or 31536000)
+    QUIZ_POOL_CHECK_INTERVAL = float(os.environ.get('QUIZ_POOL_CHECK_INTERVAL') or 1.0)  # Seconds between content checks
+    WARMUP_STRATEGY = os.environ.get('WARMUP_STRATEGY') or 'lazy'  # lazy, eager-curriculum or eager-everything
+    LOG_LEVEL = os.environ.get('LOG_LEVEL') or 'INFO'  # Level of the app logger, which writes to stderr
+
+    # Async (ASGI) API
+    ASYNC_SNAPSHOT_REFRESH = float(os.environ.get('ASYNC_SNAPSHOT_REFRESH') or 30)
+    ATTEMPTS_LOG = os.environ.get('ATTEMPTS_LOG')  # JSON lines file, not written when unset
+    ATTEMPT_QUEUE_SIZE = int(os.environ.get('ATTEMPT_QUEUE_SIZE') or 10000)
+
+    # Admission control for the API blueprint
+    # Reverse proxies in front of the app whose X-Forwarded-For is trusted (0 = none)
+    TRUSTED_PROXY_COUNT = int(os.environ.get('TRUSTED_PROXY_COUNT') or 0)
+    # Header carrying an authenticated client id, e.g. set by the auth proxy; rate limits key on it
+    ADMISSION_CLIENT_ID_HEADER = os.environ.get('ADMISSION_CLIENT_ID_HEADER')
+    # Request threads per WSGI worker process (e.g. gunicorn --threads). Grading requests, running or
+    # queued, hold a thread each, so by default they may take half of them and reads keep the rest
+    WORKER_THREADS = int(os.environ.get('WORKER_THREADS') or 32)
+    GRADING_MAX_CONCURRENT = int(os.environ.get('GRADING_MAX_CONCURRENT') or max(1, WORKER_THREADS // 4))
+    GRADING_MAX_QUEUE = int(os.environ.get('GRADING_MAX_QUEUE') or WORKER_THREADS // 4)
+    GRADING_QUEUE_TIMEOUT = float(os.environ.get('GRADING_QUEUE_TIMEOUT') or 0.5)
+    GRADING_RATE_PER_CLIENT = float(os.environ.get('GRADING_RATE_PER_CLIENT') or 5)
+    GRADING_BURST_PER_CLIENT = int(os.environ.get('GRADING_BURST_PER_CLIENT') or 20)
+    API_MAX_CONCURRENT = int(os.environ.get('API_MAX_CONCURRENT') or 128)
+    API_MAX_QUEUE = int(os.environ.get('API_MAX_QUEUE') or 256)
+    API_QUEUE_TIMEOUT = float(os.environ.get('API_QUEUE_TIMEOUT') or 1.0)
+    API_RATE_PER_CLIENT = float(os.environ.get('API_RATE_PER_CLIENT') or 50)
+    API_BURST_PER_CLIENT = int(os.environ.get('API_BURST_PER_CLIENT') or 100)
 
 class DevelopmentConfig(Config):
     DEBUG = True
@@ -0,0 +1,201 @@
+import math
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from flask import g, jsonify, request
+
+from config import Config
+
+class TokenBucket:
+    """Token bucket state for a single client"""
+    __slots__ = ("tokens", "updated")
+
+    def __init__(self, tokens: float, updated: float):
+        self.tokens = tokens
+        self.updated = updated
+
+class RateLimiter:
+    """Per-client token-bucket rate limiter backed by a sharded in-memory LRU table"""
+
+    def __init__(self, rate: float, burst: int, shards: int = 16, max_clients_per_shard: int = 4096):
+        # A zero rate would never refill the bucket and has no Retry-After to give
+        if rate <= 0:
+            raise ValueError(f"rate must be positive, got {rate}")
+        if burst < 1:
+            raise ValueError(f"burst must be at least 1, got {burst}")
+        self.rate = rate
+        self.burst = burst
+        self.max_clients_per_shard = max_clients_per_shard
+        self._shards: List[Tuple[threading.Lock, "OrderedDict[str, TokenBucket]"]] = [
+            (threading.Lock(), OrderedDict()) for _ in range(shards)
+        ]
+
+    def acquire(self, client_id: str, now: Optional[float] = None) -> float:
+        """Take one token for the client; return 0 if allowed, else seconds until a token is available"""
+        if now is None:
+            now = time.monotonic()
+        lock, buckets = self._shards[hash(client_id) % len(self._shards)]
+        with lock:
+            bucket = buckets.get(client_id)
+            if bucket is None:
+                if len(buckets) >= self.max_clients_per_shard:
+                    # Hard cap: drop the least recently seen client
+                    buckets.popitem(last=False)
+                bucket = buckets[client_id] = TokenBucket(self.burst, now)
+            else:
+                buckets.move_to_end(client_id)
+                bucket.tokens = min(self.burst, bucket.tokens + (now - bucket.updated) * self.rate)
+                bucket.updated = now
+
+            if bucket.tokens >= 1:
+                bucket.tokens -= 1
+                return 0.0
+            return (1 - bucket.tokens) / self.rate
+
+class ConcurrencyLimiter:
+    """Caps in-flight requests, with a bounded wait queue and a queueing deadline"""
+
+    def __init__(self, max_concurrent: int, max_queue: int, queue_timeout: float):
+        if max_concurrent < 1:
+            raise ValueError(f"max_concurrent must be at least 1, got {max_concurrent}")
+        if max_queue < 0:
+            raise ValueError(f"max_queue must not be negative, got {max_queue}")
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.active = 0
+        self.waiting = 0
+        self._cond = threading.Condition()
+
+    def acquire(self) -> bool:
+        """Claim a slot, waiting up to queue_timeout; return False if the request should be shed"""
+        with self._cond:
+            if self.active < self.max_concurrent:
+                self.active += 1
+                return True
+            if self.waiting >= self.max_queue:
+                return False
+
+            deadline = time.monotonic() + self.queue_timeout
+            self.waiting += 1
+            try:
+                while self.active >= self.max_concurrent:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        return False
+                    self._cond.wait(remaining)
+                self.active += 1
+                return True
+            finally:
+                self.waiting -= 1
+
+    def release(self) -> None:
+        """Free a slot and wake one queued request"""
+        with self._cond:
+            self.active -= 1
+            self._cond.notify()
+
+class EndpointLimits:
+    """Concurrency and rate limits applied to one endpoint"""
+
+    def __init__(self, max_concurrent: int, max_queue: int, queue_timeout: float,
+                 rate_per_client: float, burst_per_client: int):
+        self.concurrency = ConcurrencyLimiter(max_concurrent, max_queue, queue_timeout)
+        self.rate_limiter = RateLimiter(rate_per_client, burst_per_client)
+
+class AdmissionController:
+    """Admission control for blueprint routes: rate limit per client, then cap concurrency per endpoint"""
+
+    def __init__(self, limits: Dict[str, EndpointLimits], default_settings: Dict[str, float],
+                 client_id_header: Optional[str] = None):
+        self.limits = limits
+        self.default_settings = default_settings
+        self.client_id_header = client_id_header
+        self._lock = threading.Lock()
+
+    def init_blueprint(self, blueprint) -> None:
+        """Install the admission hooks in front of every route of the blueprint"""
+        blueprint.before_request(self.admit)
+        blueprint.teardown_request(self.release)
+
+    def limits_for(self, endpoint: Optional[str]) -> EndpointLimits:
+        """Get the limits for an endpoint, giving unlisted endpoints their own pool with default settings"""
+        limits = self.limits.get(endpoint)
+        if limits is None:
+            with self._lock:
+                limits = self.limits.get(endpoint)
+                if limits is None:
+                    limits = self.limits[endpoint] = EndpointLimits(**self.default_settings)
+        return limits
+
+    def client_key(self) -> str:
+        """Identify the client: the authenticated client id header if configured, else the remote address"""
+        # The header must be set by a trusted proxy; remote_addr is the real client only with ProxyFix
+        if self.client_id_header:
+            client_id = request.headers.get(self.client_id_header)
+            if client_id:
+                return "id:" + client_id
+        return "addr:" + (request.remote_addr or "unknown")
+
+    def admit(self):
+        """Reject the request early with 429/503 when it cannot be admitted"""
+        limits = self.limits_for(request.endpoint)
+
+        retry_after = limits.rate_limiter.acquire(self.client_key())
+        if retry_after:
+            return self._reject(429, "Too many requests", retry_after)
+
+        if not limits.concurrency.acquire():
+            return self._reject(503, "Server is busy, please retry", limits.concurrency.queue_timeout)
+
+        g.admission_limits = limits
+        return None
+
+    def release(self, exc=None) -> None:
+        limits = g.pop("admission_limits", None)
+        if limits is not None:
+            limits.concurrency.release()
+
+    def _reject(self, status: int, error: str, retry_after: float):
+        response = jsonify({
+            "success": False,
+            "error": error
+        })
+        response.status_code = status
+        response.headers["Retry-After"] = str(max(1, math.ceil(retry_after)))
+        return response
+
+def build_limits() -> Dict[str, EndpointLimits]:
+    """Build the configured endpoint limits; exercise and quiz grading share one pool of grading limits"""
+    # Queued requests wait inside before_request on a worker thread; leave threads for reads
+    if Config.GRADING_MAX_CONCURRENT + Config.GRADING_MAX_QUEUE >= Config.WORKER_THREADS:
+        raise ValueError(
+            f"GRADING_MAX_CONCURRENT + GRADING_MAX_QUEUE must be less than WORKER_THREADS "
+            f"({Config.WORKER_THREADS}) so that reads always have a thread"
+        )
+    grading_limits = EndpointLimits(
+        Config.GRADING_MAX_CONCURRENT,
+        Config.GRADING_MAX_QUEUE,
+        Config.GRADING_QUEUE_TIMEOUT,
+        Config.GRADING_RATE_PER_CLIENT,
+        Config.GRADING_BURST_PER_CLIENT,
+    )
+    return {
+        "api.submit_exercise_attempt": grading_limits,
+        "api.submit_quiz_attempt": grading_limits,
+    }
+
+# Global instance
+admission_controller = AdmissionController(
+    limits=build_limits(),
+    default_settings={
+        "max_concurrent": Config.API_MAX_CONCURRENT,
+        "max_queue": Config.API_MAX_QUEUE,
+        "queue_timeout": Config.API_QUEUE_TIMEOUT,
+        "rate_per_client": Config.API_RATE_PER_CLIENT,
+        "burst_per_client": Config.API_BURST_PER_CLIENT,
+    },
+    client_id_header=Config.ADMISSION_CLIENT_ID_HEADER,
+)
\ No newline at end of file
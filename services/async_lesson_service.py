@@ -0,0 +1,117 @@
+import json
+import asyncio
+from typing import Dict, List, Optional, Any, Tuple
+
+from services.lesson_service import LessonService
+
+class AsyncLessonService:
+    """Non-blocking lesson access for the ASGI API, served from an in-memory content snapshot
+
+    The snapshot holds the curriculum and every lesson file and is authoritative: a lesson
+    that is not in it does not exist until the next refresh, so lookups never touch the disk.
+    """
+
+    def __init__(self, lesson_service: LessonService):
+        self.lesson_service = lesson_service
+        self._curriculum: Optional[Dict[str, Any]] = None
+        self._lessons: Dict[str, Dict[str, Any]] = {}
+        self._content_key: Optional[Tuple] = None
+
+    async def load_snapshot(self) -> None:
+        """Read the curriculum and every lesson file in a worker thread, then swap the snapshot in"""
+        loop = asyncio.get_running_loop()
+        key, curriculum, lessons = await loop.run_in_executor(None, self._read_snapshot)
+        self._curriculum, self._lessons, self._content_key = curriculum, lessons, key
+
+    async def refresh_if_changed(self) -> bool:
+        """Reload the snapshot when curriculum.json or any lesson file has changed, e.g. after a content ingest"""
+        loop = asyncio.get_running_loop()
+        key = await loop.run_in_executor(None, self.lesson_service.content_key)
+        if key == self._content_key:
+            return False
+        await self.load_snapshot()
+        return True
+
+    async def get_lessons_list(self) -> List[Dict[str, Any]]:
+        if self._curriculum is None:
+            await self.load_snapshot()
+        return self._curriculum.get("lessons", [])
+
+    async def get_lesson_by_id(self, lesson_id: str) -> Optional[Dict[str, Any]]:
+        if self._curriculum is None:
+            await self.load_snapshot()
+        return self._lessons.get(lesson_id)
+
+    async def validate_exercise_answer(self, lesson_id: str, exercise_id: str, user_answer: str) -> Dict[str, Any]:
+        lesson = await self.get_lesson_by_id(lesson_id)
+        exercise = None
+        if lesson:
+            exercise = next((ex for ex in lesson.get("exercises", []) if ex.get("id") == exercise_id), None)
+        return self.lesson_service.check_answer(exercise, user_answer)
+
+    def _read_snapshot(self) -> Tuple[Tuple, Dict[str, Any], Dict[str, Dict[str, Any]]]:
+        # Take the key first so a change made while reading is picked up by the next refresh;
+        # unchanged files come from the lesson service cache without being parsed again
+        key = self.lesson_service.content_key()
+        curriculum = self.lesson_service.get_curriculum()
+        lessons = {}
+        for lesson_id, _ in key[3]:
+            lesson = self.lesson_service.get_lesson_by_id(lesson_id)
+            if lesson:
+                lessons[lesson_id] = lesson
+        return key, curriculum, lessons
+
+class AttemptRecorder:
+    """Records exercise attempts off the request path through a bounded asyncio queue"""
+
+    def __init__(self, log_file: Optional[str] = None, max_queue: int = 10000, batch_size: int = 500):
+        self.log_file = log_file
+        self.max_queue = max_queue
+        self.batch_size = batch_size
+        # (lesson_id, exercise_id) -> [attempts, correct]
+        self.stats: Dict[Tuple[str, str], List[int]] = {}
+        self.dropped = 0
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        self._queue = asyncio.Queue(self.max_queue)
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Flush queued attempts and stop the consumer"""
+        if self._task is None:
+            return
+        await self._queue.put(None)
+        await self._task
+        self._task = None
+
+    def record(self, lesson_id: str, exercise_id: str, correct: bool) -> None:
+        """Queue an attempt without waiting; attempts are dropped rather than slowing grading down"""
+        try:
+            self._queue.put_nowait((lesson_id, exercise_id, correct))
+        except asyncio.QueueFull:
+            self.dropped += 1
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        stopping = False
+        while not stopping:
+            batch = [await self._queue.get()]
+            while len(batch) < self.batch_size and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            if None in batch:
+                stopping = True
+                batch = [attempt for attempt in batch if attempt is not None]
+
+            for lesson_id, exercise_id, correct in batch:
+                counts = self.stats.setdefault((lesson_id, exercise_id), [0, 0])
+                counts[0] += 1
+                counts[1] += int(correct)
+            if self.log_file and batch:
+                await loop.run_in_executor(None, self._append_log, batch)
+
+    def _append_log(self, batch: List[Tuple[str, str, bool]]) -> None:
+        with open(self.log_file, 'a', encoding='utf-8') as f:
+            for lesson_id, exercise_id, correct in batch:
+                f.write(json.dumps({"lesson_id": lesson_id, "exercise_id": exercise_id, "correct": correct}) + "\n")
@@ -0,0 +1,95 @@
+import os
+import hashlib
+import threading
+from typing import Dict, List, Optional, Any, Tuple
+
+from werkzeug.security import safe_join
+
+from config import Config
+
+# Vocabulary entries reference audio as "audio/<filename>"
+AUDIO_PATH_PREFIX = "audio/"
+
+class AudioService:
+    def __init__(self, audio_dir: str = os.path.join("content", "audio")):
+        self.audio_dir = audio_dir
+        # Digest cache keyed by absolute path: (mtime_ns, size, sha256)
+        self._digests: Dict[str, Tuple[int, int, str]] = {}
+        self._lock = threading.Lock()
+
+    def resolve_path(self, filename: str) -> Optional[str]:
+        """Resolve an audio filename inside the audio directory, refusing path traversal"""
+        path = safe_join(os.path.abspath(self.audio_dir), filename)
+        if path is None or not os.path.isfile(path):
+            return None
+        return path
+
+    def get_file_info(self, filename: str) -> Optional[Dict[str, Any]]:
+        """Get path, size and content hash of an audio file"""
+        path = self.resolve_path(filename)
+        if not path:
+            return None
+
+        stat = os.stat(path)
+        with self._lock:
+            cached = self._digests.get(path)
+        if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+            digest = cached[2]
+        else:
+            digest = self._hash_file(path)
+            with self._lock:
+                self._digests[path] = (stat.st_mtime_ns, stat.st_size, digest)
+
+        return {
+            "path": path,
+            "size": stat.st_size,
+            "sha256": digest
+        }
+
+    def get_lesson_manifest(self, lesson: Dict[str, Any]) -> Dict[str, Any]:
+        """List every audio file referenced by a lesson, with size and hash, for batch prefetch"""
+        files: List[Dict[str, Any]] = []
+        missing: List[str] = []
+        seen = set()
+
+        for word in lesson.get("vocabulary", []):
+            audio = word.get("audio")
+            if not audio or audio in seen:
+                continue
+            seen.add(audio)
+
+            filename = audio_filename(audio)
+            info = self.get_file_info(filename)
+            if not info:
+                missing.append(audio)
+                continue
+            files.append({
+                "audio": audio,
+                "filename": filename,
+                "size": info["size"],
+                "sha256": info["sha256"]
+            })
+
+        return {
+            "lesson_id": lesson.get("id"),
+            "files": files,
+            "total_size": sum(f["size"] for f in files),
+            "missing": missing
+        }
+
+    @staticmethod
+    def _hash_file(path: str) -> str:
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+def audio_filename(audio: str) -> str:
+    """Convert a vocabulary audio reference to a filename inside the audio directory"""
+    if audio.startswith(AUDIO_PATH_PREFIX):
+        return audio[len(AUDIO_PATH_PREFIX):]
+    return audio
+
+# Global instance
+audio_service = AudioService(os.path.join(Config.CONTENT_DIR, Config.AUDIO_DIR))
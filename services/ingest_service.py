@@ -0,0 +1,339 @@
+import os
+import re
+import csv
+import json
+import stat
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Any, Union
+
+# A lesson source is either the path of a lesson JSON file or an already built lesson
+LessonSource = Union[str, Dict[str, Any]]
+
+LESSON_ID_PATTERN = re.compile(r'^[A-Za-z0-9_-]+$')
+CURRICULUM_FIELDS = ("id", "title", "description", "level", "category")
+VOCABULARY_CSV_COLUMNS = ("lesson_id", "chinese", "pinyin", "english")
+
+def load_lesson(source: LessonSource) -> Dict[str, Any]:
+    if isinstance(source, dict):
+        return source
+    with open(source, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def validate_lesson(lesson: Any) -> List[str]:
+    """Check a lesson against the lesson schema and return a list of problems"""
+    if not isinstance(lesson, dict):
+        return ["lesson must be a JSON object"]
+
+    errors = []
+    lesson_id = lesson.get("id")
+    if not isinstance(lesson_id, str) or not LESSON_ID_PATTERN.match(lesson_id):
+        errors.append("id must be a non-empty string of letters, digits, '-' or '_'")
+    for field in ("title", "level", "category"):
+        if not isinstance(lesson.get(field), str) or not lesson.get(field):
+            errors.append(f"{field} must be a non-empty string")
+    for field in ("vocabulary", "grammar", "exercises"):
+        if not isinstance(lesson.get(field, []), list):
+            errors.append(f"{field} must be a list")
+    if errors:
+        return errors
+
+    for i, word in enumerate(lesson.get("vocabulary", [])):
+        if not isinstance(word, dict) or not all(isinstance(word.get(k), str) for k in ("chinese", "pinyin", "english")):
+            errors.append(f"vocabulary[{i}] must have chinese, pinyin and english strings")
+
+    for i, point in enumerate(lesson.get("grammar", [])):
+        if not isinstance(point, dict) or not isinstance(point.get("title"), str):
+            errors.append(f"grammar[{i}] must have a title")
+
+    seen_ids = set()
+    for i, exercise in enumerate(lesson.get("exercises", [])):
+        if not isinstance(exercise, dict):
+            errors.append(f"exercises[{i}] must be an object")
+            continue
+        exercise_id = exercise.get("id")
+        if not isinstance(exercise_id, str) or not exercise_id:
+            errors.append(f"exercises[{i}] must have an id")
+        elif exercise_id in seen_ids:
+            errors.append(f"exercise id '{exercise_id}' is not unique")
+        seen_ids.add(exercise_id)
+
+        if not isinstance(exercise.get("question"), str):
+            errors.append(f"exercise '{exercise_id}' must have a question")
+        if "correct_answer" not in exercise:
+            errors.append(f"exercise '{exercise_id}' must have a correct_answer")
+        elif exercise.get("type") == "multiple_choice":
+            options = exercise.get("options")
+            correct_answer = exercise["correct_answer"]
+            if not isinstance(options, list) or len(options) < 2:
+                errors.append(f"exercise '{exercise_id}' must have at least two options")
+            elif (not isinstance(correct_answer, int) or isinstance(correct_answer, bool)
+                    or not 0 <= correct_answer < len(options)):
+                errors.append(f"exercise '{exercise_id}' correct_answer must be an index into options")
+    return errors
+
+def _check_lesson(source: LessonSource) -> Dict[str, Any]:
+    """Worker: load and validate one lesson, returning only what the parent needs"""
+    try:
+        lesson = load_lesson(source)
+    except (OSError, ValueError) as e:
+        return {"errors": [f"cannot read lesson: {e}"]}
+
+    errors = validate_lesson(lesson)
+    if errors:
+        return {"errors": errors}
+
+    return {
+        "errors": [],
+        "summary": curriculum_entry(lesson),
+        "exercise_ids": [exercise["id"] for exercise in lesson.get("exercises", [])]
+    }
+
+def _write_lesson(source: LessonSource, lessons_dir: str) -> str:
+    """Worker: write one lesson to the lessons directory atomically"""
+    lesson = load_lesson(source)
+    write_json_atomic(os.path.join(lessons_dir, f"{lesson['id']}.json"), lesson)
+    return lesson["id"]
+
+def curriculum_entry(lesson: Dict[str, Any]) -> Dict[str, Any]:
+    entry = {field: lesson.get(field, "") for field in CURRICULUM_FIELDS}
+    if "estimated_duration" in lesson:
+        entry["estimated_duration"] = lesson["estimated_duration"]
+    return entry
+
+def write_json_atomic(path: str, data: Any) -> None:
+    """Write JSON to a temporary file next to path, then rename it over path"""
+    directory = os.path.dirname(path) or "."
+    # mkstemp creates the file as 0600; keep the replaced file's mode, or make it world-readable
+    try:
+        mode = stat.S_IMODE(os.stat(path).st_mode)
+    except FileNotFoundError:
+        mode = 0o644
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-", suffix=".json")
+    try:
+        os.fchmod(fd, mode)
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+            f.write("\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+class IngestService:
+    def __init__(self, content_dir: str = "content", workers: Optional[int] = None):
+        self.content_dir = content_dir
+        self.lessons_dir = os.path.join(content_dir, "lessons")
+        self.curriculum_file = os.path.join(content_dir, "curriculum.json")
+        self.workers = workers or os.cpu_count() or 1
+
+    def validate(self) -> Dict[str, Any]:
+        """Validate the lessons on disk and check that they agree with the curriculum"""
+        existing = self._existing_lessons()
+        report = self._check(existing)
+        if report["errors"]:
+            return report
+
+        for key, summary in report["summaries"].items():
+            if os.path.basename(key) != f"{summary['id']}.json":
+                report["errors"].append(f"{key}: file name does not match lesson id '{summary['id']}'")
+
+        curriculum = self._load_curriculum()
+        by_id = {s["id"]: s for s in report["summaries"].values()}
+        listed = set()
+        for entry in curriculum.get("lessons", []):
+            lesson_id = entry.get("id")
+            listed.add(lesson_id)
+            summary = by_id.get(lesson_id)
+            if not summary:
+                report["errors"].append(f"curriculum: lesson '{lesson_id}' has no lesson file")
+                continue
+            for field in CURRICULUM_FIELDS:
+                if field in entry and entry[field] != summary[field]:
+                    report["errors"].append(f"curriculum: {field} of lesson '{lesson_id}' does not match its lesson file")
+        for lesson_id in by_id:
+            if lesson_id not in listed:
+                report["errors"].append(f"curriculum: lesson '{lesson_id}' is missing from curriculum.json")
+        return report
+
+    def ingest(self, paths: List[str], dry_run: bool = False) -> Dict[str, Any]:
+        """Validate lesson files or vocabulary CSV/TSV dumps, then write them and regenerate the curriculum"""
+        imported: Dict[str, LessonSource] = {}
+        row_errors: List[str] = []
+        for path in self._expand_paths(paths):
+            if path.lower().endswith((".csv", ".tsv")):
+                try:
+                    lessons = self._lessons_from_vocabulary_dump(path, imported, row_errors)
+                except (OSError, ValueError) as e:
+                    return {"errors": [f"{path}: cannot read vocabulary dump: {e}"], "checked": 0}
+                for lesson in lessons:
+                    imported[path + "#" + lesson["id"]] = lesson
+            else:
+                imported[path] = path
+
+        # Lessons already on disk take part in the checks unless the import replaces them
+        report = self._check({**self._existing_lessons(), **imported}, imported)
+        report["errors"] = row_errors + report["errors"]
+        if report["errors"] or dry_run:
+            return report
+
+        os.makedirs(self.lessons_dir, exist_ok=True)
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            sources = [imported[key] for key in report["imported_keys"]]
+            report["written"] = list(executor.map(_write_lesson, sources, [self.lessons_dir] * len(sources),
+                                                  chunksize=self._chunksize(len(sources))))
+
+        curriculum = self._regenerate_curriculum(report["summaries"])
+        write_json_atomic(self.curriculum_file, curriculum)
+        report["curriculum_lessons"] = len(curriculum["lessons"])
+        return report
+
+    def _check(self, sources: Dict[str, LessonSource], imported: Optional[Dict[str, LessonSource]] = None) -> Dict[str, Any]:
+        """Validate lessons in a process pool, then check that lesson and exercise ids are unique"""
+        imported = imported or {}
+        keys = list(sources)
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            results = list(executor.map(_check_lesson, [sources[k] for k in keys],
+                                        chunksize=self._chunksize(len(keys))))
+
+        errors: List[str] = []
+        lessons: Dict[str, Dict[str, Any]] = {}
+        for key, result in zip(keys, results):
+            errors.extend(f"{key}: {error}" for error in result["errors"])
+            if result["errors"]:
+                continue
+
+            lesson_id = result["summary"]["id"]
+            previous = lessons.get(lesson_id)
+            # An imported lesson may replace a lesson file already on disk, nothing else may share an id
+            if previous and not (key in imported and previous["key"] not in imported):
+                errors.append(f"{key}: lesson id '{lesson_id}' is also used by {previous['key']}")
+                continue
+            lessons[lesson_id] = {"key": key, **result}
+
+        owners: Dict[str, str] = {}
+        for lesson_id, lesson in lessons.items():
+            for exercise_id in lesson["exercise_ids"]:
+                owner = owners.setdefault(exercise_id, lesson_id)
+                if owner != lesson_id:
+                    errors.append(f"{lesson['key']}: exercise id '{exercise_id}' is also used by lesson '{owner}'")
+
+        return {
+            "errors": errors,
+            "summaries": {lesson["key"]: lesson["summary"] for lesson in lessons.values()},
+            "imported_keys": [lesson["key"] for lesson in lessons.values() if lesson["key"] in imported],
+            "checked": len(keys)
+        }
+
+    def _regenerate_curriculum(self, summaries: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+        """Rebuild curriculum.json from lesson files, keeping the existing order and extra fields"""
+        by_id = {s["id"]: s for s in summaries.values()}
+        curriculum = self._load_curriculum()
+
+        lessons = []
+        for entry in curriculum.get("lessons", []):
+            summary = by_id.pop(entry.get("id"), None)
+            if summary:
+                lessons.append({**entry, **summary})
+        lessons.extend(by_id.values())
+
+        curriculum["lessons"] = lessons
+        return curriculum
+
+    def _load_curriculum(self) -> Dict[str, Any]:
+        try:
+            with open(self.curriculum_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {"lessons": []}
+
+    def _existing_lessons(self) -> Dict[str, LessonSource]:
+        if not os.path.isdir(self.lessons_dir):
+            return {}
+        return {
+            os.path.join(self.lessons_dir, name): os.path.join(self.lessons_dir, name)
+            for name in sorted(os.listdir(self.lessons_dir))
+            if name.endswith(".json") and not name.startswith(".")
+        }
+
+    def _lessons_from_vocabulary_dump(self, path: str, imported: Dict[str, LessonSource],
+                                      errors: List[str]) -> List[Dict[str, Any]]:
+        """Group CSV/TSV vocabulary rows into lessons, replacing the vocabulary of lessons that exist
+
+        Rows with missing or empty required cells, or a lesson_id that is not a valid lesson id,
+        are skipped and reported in errors.
+        """
+        delimiter = "\t" if path.lower().endswith(".tsv") else ","
+        with open(path, 'r', encoding='utf-8', newline='') as f:
+            reader = csv.DictReader(f, delimiter=delimiter)
+            missing = [c for c in VOCABULARY_CSV_COLUMNS if c not in (reader.fieldnames or [])]
+            if missing:
+                raise ValueError(f"missing columns {', '.join(missing)}")
+            # Short rows give None for the missing cells
+            rows = [(reader.line_num, {k: (v or "").strip() for k, v in row.items() if k is not None})
+                    for row in reader]
+
+        lessons: Dict[str, Dict[str, Any]] = {}
+        for line, row in rows:
+            empty = [column for column in VOCABULARY_CSV_COLUMNS if not row.get(column)]
+            if empty:
+                errors.append(f"{path}:{line}: missing {', '.join(empty)}")
+                continue
+
+            lesson_id = row["lesson_id"]
+            # The id becomes a file name, so it is checked before anything is read from disk
+            if not LESSON_ID_PATTERN.match(lesson_id):
+                errors.append(f"{path}:{line}: lesson_id '{lesson_id}' must contain only letters, digits, '-' or '_'")
+                continue
+
+            lesson = lessons.get(lesson_id)
+            if lesson is None:
+                try:
+                    lesson = self._base_lesson(lesson_id, imported)
+                except ValueError as e:
+                    errors.append(f"{path}:{line}: {e}")
+                    continue
+                lessons[lesson_id] = lesson
+                lesson["vocabulary"] = []
+                for field in ("title", "description", "level", "category"):
+                    if row.get(field):
+                        lesson[field] = row[field]
+
+            word = {key: row[key] for key in ("chinese", "pinyin", "english")}
+            if row.get("audio"):
+                word["audio"] = row["audio"]
+            lesson["vocabulary"].append(word)
+        return list(lessons.values())
+
+    def _base_lesson(self, lesson_id: str, imported: Dict[str, LessonSource]) -> Dict[str, Any]:
+        for source in imported.values():
+            if isinstance(source, dict) and source.get("id") == lesson_id:
+                return dict(source)
+        lesson_file = os.path.join(self.lessons_dir, f"{lesson_id}.json")
+        try:
+            lesson = load_lesson(lesson_file)
+        except FileNotFoundError:
+            return {"id": lesson_id, "grammar": [], "exercises": []}
+        except (OSError, ValueError) as e:
+            raise ValueError(f"cannot read existing lesson '{lesson_id}': {e}")
+        if not isinstance(lesson, dict) or lesson.get("id") != lesson_id:
+            raise ValueError(f"existing lesson file {lesson_file} does not have id '{lesson_id}'")
+        return lesson
+
+    def _expand_paths(self, paths: List[str]) -> List[str]:
+        expanded = []
+        for path in paths:
+            if os.path.isdir(path):
+                expanded.extend(
+                    os.path.join(path, name) for name in sorted(os.listdir(path))
+                    if name.lower().endswith((".json", ".csv", ".tsv"))
+                )
+            else:
+                expanded.append(path)
+        return expanded
+
+    def _chunksize(self, count: int) -> int:
+        return max(1, count // (self.workers * 8))
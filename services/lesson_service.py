@@ -1,18 +1,19 @@
 import os
 import json
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 
 class LessonService:
     def __init__(self, content_dir: str = "content"):
         self.content_dir = content_dir
         self.lessons_dir = os.path.join(content_dir, "lessons")
         self.curriculum_file = os.path.join(content_dir, "curriculum.json")
+        # path -> ((mtime_ns, size, inode), parsed content); callers must not modify cached content
+        self._cache: Dict[str, Tuple[Tuple[int, int, int], Any]] = {}
     
     def get_curriculum(self) -> Dict[str, Any]:
         """Load the curriculum metadata"""
         try:
-            with open(self.curriculum_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            return self._load_json(self.curriculum_file)
         except FileNotFoundError:
             return {"lessons": []}
     
@@ -25,11 +26,42 @@ class LessonService:
         """Load a specific lesson by ID"""
         lesson_file = os.path.join(self.lessons_dir, f"{lesson_id}.json")
         try:
-            with open(lesson_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            return self._load_json(lesson_file)
         except FileNotFoundError:
             return None
     
+    def content_key(self) -> Tuple:
+        """Identify the current content: the paths, and (mtime_ns, size, inode) of the curriculum and every lesson file
+        
+        Lesson files are listed in one scandir pass, so an in-place edit of any lesson changes the key.
+        """
+        try:
+            curriculum = _stat_key(os.stat(self.curriculum_file))
+        except FileNotFoundError:
+            curriculum = None
+        
+        lessons = []
+        try:
+            with os.scandir(self.lessons_dir) as entries:
+                for entry in entries:
+                    if entry.name.endswith(".json") and not entry.name.startswith("."):
+                        lessons.append((entry.name[:-len(".json")], _stat_key(entry.stat())))
+        except FileNotFoundError:
+            pass
+        return (self.curriculum_file, curriculum, self.lessons_dir, tuple(sorted(lessons)))
+    
+    def _load_json(self, path: str) -> Any:
+        """Load a JSON file, reusing the parsed content until the file changes"""
+        key = _stat_key(os.stat(path))
+        cached = self._cache.get(path)
+        if cached and cached[0] == key:
+            return cached[1]
+        
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        self._cache[path] = (key, data)
+        return data
+    
     def get_exercise_by_id(self, lesson_id: str, exercise_id: str) -> Optional[Dict[str, Any]]:
         """Get a specific exercise from a lesson"""
         lesson = self.get_lesson_by_id(lesson_id)
@@ -44,6 +76,10 @@ class LessonService:
     def validate_exercise_answer(self, lesson_id: str, exercise_id: str, user_answer: str) -> Dict[str, Any]:
         """Validate user's answer to an exercise"""
         exercise = self.get_exercise_by_id(lesson_id, exercise_id)
+        return self.check_answer(exercise, user_answer)
+    
+    def check_answer(self, exercise: Optional[Dict[str, Any]], user_answer: str) -> Dict[str, Any]:
+        """Check user's answer against an already loaded exercise"""
         if not exercise:
             return {
                 "valid": False,
@@ -70,5 +106,9 @@ class LessonService:
             "correct_answer": correct_answer
         }
 
+def _stat_key(stat: os.stat_result) -> Tuple[int, int, int]:
+    # Ingest replaces files by rename, which always changes the inode
+    return (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+
 # Global instance
 lesson_service = LessonService()
\ No newline at end of file
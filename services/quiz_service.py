@@ -0,0 +1,225 @@
+import hashlib
+import secrets
+import threading
+import time
+from typing import Dict, List, Optional, Any, Tuple
+
+import numpy as np
+from itsdangerous import BadSignature, URLSafeSerializer
+
+from config import Config
+from services.lesson_service import LessonService, lesson_service
+
+class VocabularyPool:
+    """Vocabulary from all lessons, with per-level and per-category index arrays"""
+
+    def __init__(self, words: List[Dict[str, Any]]):
+        self.words = words
+        self.chinese = [w["chinese"] for w in words]
+        self.pinyin = [w.get("pinyin", "") for w in words]
+        self.english = [w["english"] for w in words]
+
+        levels = np.array([w["level"] for w in words], dtype=object)
+        categories = np.array([w["category"] for w in words], dtype=object)
+        self.level_pools: Dict[str, np.ndarray] = {
+            level: np.flatnonzero(levels == level) for level in set(levels)
+        }
+        self.category_pools: Dict[Tuple[str, str], np.ndarray] = {
+            (level, category): np.flatnonzero((levels == level) & (categories == category))
+            for level, category in set(zip(levels, categories))
+        }
+
+        fingerprint = hashlib.sha256()
+        for w in words:
+            fingerprint.update(f"{w['level']}\0{w['category']}\0{w['chinese']}\0{w['english']}\n".encode('utf-8'))
+        self.version = fingerprint.hexdigest()[:12]
+
+    def get_pool(self, level: str, category: Optional[str] = None) -> np.ndarray:
+        if category:
+            return self.category_pools.get((level, category), np.empty(0, dtype=np.intp))
+        return self.level_pools.get(level, np.empty(0, dtype=np.intp))
+
+class QuizService:
+    def __init__(self, lesson_service: LessonService, secret_key: str = Config.SECRET_KEY,
+                 num_options: int = 4, max_questions: int = 100,
+                 check_interval: float = Config.QUIZ_POOL_CHECK_INTERVAL):
+        self.lesson_service = lesson_service
+        self.num_options = num_options
+        self.max_questions = max_questions
+        self.check_interval = check_interval
+        self._serializer = URLSafeSerializer(secret_key, salt="quiz")
+        self._pool: Optional[VocabularyPool] = None
+        self._pool_key: Optional[Tuple] = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def get_pool(self) -> VocabularyPool:
+        """Get the vocabulary pool, rebuilding it when the curriculum or any lesson file changes
+
+        One request at a time checks the content and rebuilds the pool; other requests keep
+        using the current pool until the new one is swapped in.
+        """
+        if self._is_fresh():
+            return self._pool
+
+        # Only the first build, or a switch to other content, has no usable pool to fall back on
+        usable = self._pool is not None and self._pool_key[0] == self.lesson_service.curriculum_file
+        if not self._lock.acquire(blocking=not usable):
+            return self._pool
+        try:
+            if self._is_fresh():
+                return self._pool
+            key = self.lesson_service.content_key()
+            if self._pool is None or self._pool_key != key:
+                pool = self._build_pool()
+                self._pool, self._pool_key = pool, key
+            self._checked_at = time.monotonic()
+            return self._pool
+        finally:
+            self._lock.release()
+
+    def _is_fresh(self) -> bool:
+        # Stat the content at most once per check_interval
+        return (self._pool is not None and self._pool_key[0] == self.lesson_service.curriculum_file
+                and time.monotonic() - self._checked_at < self.check_interval)
+
+    def _build_pool(self) -> VocabularyPool:
+        words = []
+        seen = set()
+        for summary in self.lesson_service.get_lessons_list():
+            lesson = self.lesson_service.get_lesson_by_id(summary["id"])
+            if not lesson:
+                continue
+            level = lesson.get("level", summary.get("level"))
+            category = lesson.get("category", summary.get("category"))
+            for word in lesson.get("vocabulary", []):
+                if not word.get("chinese") or not word.get("english"):
+                    continue
+                # Two words with the same meaning would give a question two identical options
+                word_key = (level, word["english"].strip().lower())
+                if word_key in seen:
+                    continue
+                seen.add(word_key)
+                words.append({
+                    "chinese": word["chinese"],
+                    "pinyin": word.get("pinyin", ""),
+                    "english": word["english"],
+                    "level": level,
+                    "category": category,
+                    "lesson_id": lesson.get("id")
+                })
+        return VocabularyPool(words)
+
+    def generate_quiz(self, level: str, n: int, category: Optional[str] = None) -> Dict[str, Any]:
+        """Generate a fresh multiple choice quiz, gradable later from its token"""
+        if n < 1 or n > self.max_questions:
+            return {
+                "valid": False,
+                "error": f"n must be between 1 and {self.max_questions}"
+            }
+
+        pool = self.get_pool()
+        if len(pool.get_pool(level, category)) < 2:
+            return {
+                "valid": False,
+                "error": "Not enough vocabulary for this level"
+            }
+
+        seed = secrets.randbits(63)
+        token = self._serializer.dumps([level, category, n, seed, pool.version])
+        return {
+            "valid": True,
+            "token": token,
+            "level": level,
+            "category": category,
+            "exercises": self._build_exercises(pool, level, category, n, seed)
+        }
+
+    def validate_quiz_answer(self, token: str, exercise_id: str, user_answer: Any) -> Dict[str, Any]:
+        """Validate an answer to a generated quiz by regenerating it from its token"""
+        try:
+            level, category, n, seed, version = self._serializer.loads(token)
+        except (BadSignature, ValueError, TypeError):
+            return {
+                "valid": False,
+                "error": "Invalid quiz token"
+            }
+
+        pool = self.get_pool()
+        if version != pool.version:
+            return {
+                "valid": False,
+                "error": "Quiz has expired because the lesson content changed"
+            }
+
+        exercises = self._build_exercises(pool, level, category, n, seed, include_answers=True)
+        exercise = next((ex for ex in exercises if ex["id"] == exercise_id), None)
+        if not exercise:
+            return {
+                "valid": False,
+                "error": "Exercise not found"
+            }
+
+        try:
+            is_correct = int(user_answer) == exercise["correct_answer"]
+        except (ValueError, TypeError):
+            is_correct = False
+
+        return {
+            "valid": True,
+            "correct": is_correct,
+            "explanation": exercise["explanation"],
+            "correct_answer": exercise["correct_answer"]
+        }
+
+    def _build_exercises(self, pool: VocabularyPool, level: str, category: Optional[str], n: int,
+                         seed: int, include_answers: bool = False) -> List[Dict[str, Any]]:
+        indices = pool.get_pool(level, category)
+        size = len(indices)
+        k = min(self.num_options, size) - 1
+        rng = np.random.default_rng(seed)
+
+        # Positions within the pool; repeat words only when asked for more than the pool holds
+        questions = rng.choice(size, size=n, replace=n > size)
+
+        # k distinct non-zero offsets per row keep every distractor different from the answer
+        offsets = _sample_distinct(rng, n, size - 1, k) + 1
+        options = np.empty((n, k + 1), dtype=np.intp)
+        options[:, 0] = questions
+        options[:, 1:] = (questions[:, None] + offsets) % size
+
+        # Move the answer from column 0 to a random position
+        answers = rng.integers(0, k + 1, size=n)
+        rows = np.arange(n)
+        options[rows, 0] = options[rows, answers]
+        options[rows, answers] = questions
+        options = indices[options]
+
+        exercises = []
+        for i in range(n):
+            word = int(options[i, answers[i]])
+            exercise = {
+                "id": f"quiz-{i + 1}",
+                "type": "multiple_choice",
+                "question": f"What does {pool.chinese[word]} ({pool.pinyin[word]}) mean?",
+                "options": [pool.english[int(j)] for j in options[i]]
+            }
+            if include_answers:
+                exercise["correct_answer"] = int(answers[i])
+                exercise["explanation"] = f"{pool.chinese[word]} ({pool.pinyin[word]}) means {pool.english[word]}."
+            exercises.append(exercise)
+        return exercises
+
+def _sample_distinct(rng: np.random.Generator, n: int, span: int, k: int) -> np.ndarray:
+    """Sample k distinct integers in [0, span) for each of n rows in O(n * k^2)"""
+    chosen = np.empty((n, 0), dtype=np.intp)
+    for j in range(k):
+        draw = rng.integers(0, span - j, size=n)
+        # Skip over values already taken in this row, smallest first
+        for taken in np.sort(chosen, axis=1).T:
+            draw += draw >= taken
+        chosen = np.column_stack([chosen, draw])
+    return chosen
+
+# Global instance
+quiz_service = QuizService(lesson_service)
@@ -0,0 +1,47 @@
+import time
+from contextlib import contextmanager
+from typing import List, Tuple
+
+WARMUP_STRATEGIES = ("lazy", "eager-curriculum", "eager-everything")
+
+class StartupTimer:
+    """Records how long each startup phase takes"""
+
+    def __init__(self):
+        self.phases: List[Tuple[str, float]] = []
+
+    @contextmanager
+    def phase(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases.append((name, (time.perf_counter() - start) * 1000))
+
+    @property
+    def total_ms(self) -> float:
+        return sum(ms for _, ms in self.phases)
+
+    def summary(self) -> str:
+        phases = ", ".join(f"{name} {ms:.1f} ms" for name, ms in self.phases)
+        return f"Startup took {self.total_ms:.1f} ms: {phases}"
+
+def warm_up(strategy: str) -> None:
+    """Fill the content caches ahead of the first request according to the warmup strategy"""
+    if strategy not in WARMUP_STRATEGIES:
+        raise ValueError(f"Unknown warmup strategy '{strategy}', expected one of {', '.join(WARMUP_STRATEGIES)}")
+    if strategy == "lazy":
+        return
+
+    from services.lesson_service import lesson_service
+    curriculum = lesson_service.get_curriculum()
+    if strategy == "eager-curriculum":
+        return
+
+    from services.audio_service import audio_service
+    from services.quiz_service import quiz_service
+    for entry in curriculum.get("lessons", []):
+        lesson = lesson_service.get_lesson_by_id(entry.get("id"))
+        if lesson:
+            audio_service.get_lesson_manifest(lesson)
+    quiz_service.get_pool()
\ No newline at end of file
@@ -7,6 +7,12 @@ import sys
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from app import create_app
+from services.admission import admission_controller, build_limits
+
+@pytest.fixture(autouse=True)
+def fresh_admission_limits(monkeypatch):
+    """Give each test its own rate limit buckets and concurrency slots"""
+    monkeypatch.setattr(admission_controller, "limits", build_limits())
 
 @pytest.fixture
 def client():
@@ -0,0 +1,183 @@
+import pytest
+import json
+import os
+import sys
+
+# Add the parent directory to the path to import the app
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app
+from config import Config
+from services.admission import admission_controller, build_limits, ConcurrencyLimiter, EndpointLimits, RateLimiter
+
+GRADING_ENDPOINT = "api.submit_exercise_attempt"
+
+@pytest.fixture
+def app(setup_content_dir):
+    """Create application for testing with custom content directory"""
+    app = create_app()
+    app.config['TESTING'] = True
+
+    with app.app_context():
+        from services.lesson_service import lesson_service
+        lesson_service.content_dir = setup_content_dir
+        lesson_service.lessons_dir = os.path.join(setup_content_dir, "lessons")
+        lesson_service.curriculum_file = os.path.join(setup_content_dir, "curriculum.json")
+
+    return app
+
+@pytest.fixture
+def client(app):
+    """Create test client"""
+    return app.test_client()
+
+def submit_attempt(client, headers=None):
+    return client.post('/api/exercises/test-ex-1/attempt',
+                       data=json.dumps({
+                           'lesson_id': 'test-lesson',
+                           'answer': '0'
+                       }),
+                       content_type='application/json',
+                       headers=headers)
+
+class TestRateLimiter:
+    """Test the per-client token bucket"""
+
+    def test_burst_then_reject(self):
+        """Test that a client can spend its burst and is then told when to retry"""
+        limiter = RateLimiter(rate=2, burst=3)
+        assert [limiter.acquire("client", now=0.0) for _ in range(3)] == [0.0, 0.0, 0.0]
+        assert limiter.acquire("client", now=0.0) == pytest.approx(0.5)
+
+    def test_refill(self):
+        """Test that tokens refill over time"""
+        limiter = RateLimiter(rate=1, burst=1)
+        assert limiter.acquire("client", now=0.0) == 0.0
+        assert limiter.acquire("client", now=0.5) > 0
+        assert limiter.acquire("client", now=1.5) == 0.0
+
+    def test_clients_are_independent(self):
+        """Test that one client exhausting its bucket does not affect another"""
+        limiter = RateLimiter(rate=1, burst=1)
+        assert limiter.acquire("a", now=0.0) == 0.0
+        assert limiter.acquire("a", now=0.0) > 0
+        assert limiter.acquire("b", now=0.0) == 0.0
+
+    def test_rejects_non_positive_rate(self):
+        """Test a zero rate, e.g. GRADING_RATE_PER_CLIENT=0, is rejected when the limits are built"""
+        with pytest.raises(ValueError):
+            RateLimiter(rate=0, burst=1)
+        with pytest.raises(ValueError):
+            EndpointLimits(4, 4, 1.0, rate_per_client=-1, burst_per_client=1)
+        with pytest.raises(ValueError):
+            RateLimiter(rate=1, burst=0)
+
+    def test_lru_hard_cap(self):
+        """Test a full shard drops the least recently seen client"""
+        limiter = RateLimiter(rate=1, burst=1, shards=1, max_clients_per_shard=2)
+        limiter.acquire("a", now=0.0)
+        limiter.acquire("b", now=0.0)
+        limiter.acquire("a", now=0.0)
+        limiter.acquire("c", now=0.0)
+        assert list(limiter._shards[0][1]) == ["a", "c"]
+
+class TestConcurrencyLimiter:
+    """Test the in-flight request cap and wait queue"""
+
+    def test_sheds_when_queue_full(self):
+        """Test that requests beyond the cap are shed when no queue is allowed"""
+        limiter = ConcurrencyLimiter(max_concurrent=1, max_queue=0, queue_timeout=1.0)
+        assert limiter.acquire() is True
+        assert limiter.acquire() is False
+        limiter.release()
+        assert limiter.acquire() is True
+
+    def test_queue_deadline(self):
+        """Test that a queued request gives up after the queue timeout"""
+        limiter = ConcurrencyLimiter(max_concurrent=1, max_queue=1, queue_timeout=0.01)
+        assert limiter.acquire() is True
+        assert limiter.acquire() is False
+        assert limiter.waiting == 0
+
+class TestBuildLimits:
+    """Test limits built from the configuration"""
+
+    def test_grading_leaves_threads_for_reads(self):
+        """Test the default grading cap and queue fit below the worker thread count"""
+        limits = build_limits()["api.submit_exercise_attempt"].concurrency
+        assert limits.max_concurrent + limits.max_queue < Config.WORKER_THREADS
+
+    def test_grading_larger_than_thread_pool(self, monkeypatch):
+        """Test a grading cap and queue that could take every worker thread is rejected"""
+        monkeypatch.setattr(Config, "WORKER_THREADS", 32)
+        monkeypatch.setattr(Config, "GRADING_MAX_CONCURRENT", 32)
+        with pytest.raises(ValueError):
+            build_limits()
+
+class TestAdmissionControl:
+    """Test admission control in front of the API endpoints"""
+
+    def test_limits_are_fresh_per_test(self, client):
+        """Test each test starts with empty buckets, whatever ran before it"""
+        limits = admission_controller.limits_for(GRADING_ENDPOINT)
+        assert all(not buckets for _, buckets in limits.rate_limiter._shards)
+        assert limits.concurrency.active == 0
+
+    def test_rate_limited_returns_429(self, client, monkeypatch):
+        """Test that a client over its grading budget gets 429 with Retry-After"""
+        monkeypatch.setitem(admission_controller.limits, GRADING_ENDPOINT,
+                            EndpointLimits(4, 4, 1.0, rate_per_client=0.1, burst_per_client=1))
+        assert submit_attempt(client).status_code == 200
+
+        response = submit_attempt(client)
+        assert response.status_code == 429
+        assert int(response.headers["Retry-After"]) >= 1
+        assert json.loads(response.data)["success"] is False
+
+    def test_saturated_grading_returns_503(self, client, monkeypatch):
+        """Test that grading is shed with 503 once its concurrency cap is reached"""
+        limits = EndpointLimits(1, 0, 0.0, rate_per_client=100, burst_per_client=100)
+        monkeypatch.setitem(admission_controller.limits, GRADING_ENDPOINT, limits)
+        assert limits.concurrency.acquire() is True
+
+        response = submit_attempt(client)
+        assert response.status_code == 503
+        assert "Retry-After" in response.headers
+
+        # Reads have their own pool and are unaffected
+        assert client.get('/api/lessons').status_code == 200
+
+        limits.concurrency.release()
+        assert submit_attempt(client).status_code == 200
+
+    def test_slot_released_after_request(self, client, monkeypatch):
+        """Test that admitted requests give their slot back"""
+        limits = EndpointLimits(1, 0, 0.0, rate_per_client=100, burst_per_client=100)
+        monkeypatch.setitem(admission_controller.limits, GRADING_ENDPOINT, limits)
+        for _ in range(3):
+            assert submit_attempt(client).status_code == 200
+        assert limits.concurrency.active == 0
+
+    def test_clients_behind_one_address_keyed_by_client_id(self, client, monkeypatch):
+        """Test students sharing one NAT address get their own bucket from the client id header"""
+        monkeypatch.setitem(admission_controller.limits, GRADING_ENDPOINT,
+                            EndpointLimits(4, 4, 1.0, rate_per_client=0.1, burst_per_client=1))
+        monkeypatch.setattr(admission_controller, "client_id_header", "X-Client-Id")
+
+        for student in ("alice", "bob", "carol"):
+            assert submit_attempt(client, {"X-Client-Id": student}).status_code == 200
+        assert submit_attempt(client, {"X-Client-Id": "alice"}).status_code == 429
+
+    def test_clients_behind_proxy_keyed_by_forwarded_for(self, setup_content_dir, monkeypatch):
+        """Test clients behind a trusted proxy are told apart by X-Forwarded-For"""
+        monkeypatch.setattr(Config, "TRUSTED_PROXY_COUNT", 1)
+        monkeypatch.setitem(admission_controller.limits, GRADING_ENDPOINT,
+                            EndpointLimits(4, 4, 1.0, rate_per_client=0.1, burst_per_client=1))
+        app = create_app()
+        from services.lesson_service import lesson_service
+        monkeypatch.setattr(lesson_service, "lessons_dir", os.path.join(setup_content_dir, "lessons"))
+        client = app.test_client()
+
+        for address in ("10.0.0.1", "10.0.0.2"):
+            assert submit_attempt(client, {"X-Forwarded-For": address}).status_code == 200
+        assert submit_attempt(client, {"X-Forwarded-For": "10.0.0.1"}).status_code == 429
@@ -0,0 +1,247 @@
+import pytest
+import asyncio
+import json
+import os
+import sys
+
+# Add the parent directory to the path to import the app
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from asgi import create_asgi_app
+from services.lesson_service import LessonService
+from services.async_lesson_service import AsyncLessonService, AttemptRecorder
+
+@pytest.fixture
+def attempts_log(tmp_path):
+    return str(tmp_path / "attempts.jsonl")
+
+@pytest.fixture
+def asgi_app(setup_content_dir, attempts_log):
+    """Create the ASGI application with a custom content directory"""
+    app = create_asgi_app(AsyncLessonService(LessonService(setup_content_dir)),
+                          AttemptRecorder(attempts_log))
+    app.refresh_interval = 0
+    return app
+
+async def send_request(app, method, path, body=None, content_type="application/json", headers=()):
+    """Send one HTTP request to an ASGI app and return (status, response headers, raw body)"""
+    messages = [{"type": "http.request", "body": json.dumps(body).encode() if body is not None else b""}]
+    sent = []
+
+    async def receive():
+        return messages.pop(0)
+
+    async def send(message):
+        sent.append(message)
+
+    request_headers = [(b"content-type", content_type.encode())] if content_type else []
+    scope = {
+        "type": "http",
+        "method": method,
+        "path": path,
+        "headers": request_headers + [(name.lower().encode(), value.encode()) for name, value in headers],
+    }
+    await app(scope, receive, send)
+    return sent[0]["status"], {k.decode(): v.decode() for k, v in sent[0]["headers"]}, sent[1]["body"]
+
+async def call(app, method, path, body=None, content_type="application/json"):
+    """Send one HTTP request to an ASGI app and return (status, parsed JSON body)"""
+    status, _, response_body = await send_request(app, method, path, body, content_type)
+    return status, json.loads(response_body)
+
+def run(app, *requests):
+    async def main():
+        results = [await call(app, *request) for request in requests]
+        await app.shutdown()
+        return results
+    return asyncio.run(main())
+
+class TestAsyncLessonService:
+    """Test the snapshot backed lesson service"""
+
+    def test_snapshot(self, setup_content_dir):
+        """Test lessons listed in the curriculum are served from the snapshot"""
+        service = AsyncLessonService(LessonService(setup_content_dir))
+
+        async def main():
+            await service.load_snapshot()
+            return await service.get_lessons_list(), await service.get_lesson_by_id("test-lesson")
+
+        lessons, lesson = asyncio.run(main())
+        assert lessons[0]["id"] == "test-lesson"
+        assert lesson["title"] == "Test Lesson"
+
+    def test_refresh_if_changed(self, setup_content_dir):
+        """Test the snapshot reloads only when curriculum.json changes"""
+        service = AsyncLessonService(LessonService(setup_content_dir))
+        curriculum_file = os.path.join(setup_content_dir, "curriculum.json")
+
+        async def main():
+            await service.load_snapshot()
+            unchanged = await service.refresh_if_changed()
+            with open(curriculum_file, "w", encoding="utf-8") as f:
+                json.dump({"lessons": []}, f)
+            os.utime(curriculum_file, ns=(0, 0))
+            changed = await service.refresh_if_changed()
+            return unchanged, changed, await service.get_lessons_list()
+
+        unchanged, changed, lessons = asyncio.run(main())
+        assert unchanged is False
+        assert changed is True
+        assert lessons == []
+
+    def test_snapshot_is_authoritative(self, setup_content_dir, sample_lesson_data):
+        """Test misses are answered from the snapshot and new lesson files appear after a refresh"""
+        lesson_service = LessonService(setup_content_dir)
+        service = AsyncLessonService(lesson_service)
+        lesson_file = os.path.join(setup_content_dir, "lessons", "other-lesson.json")
+
+        async def main():
+            await service.load_snapshot()
+            reads = []
+            read_lesson = lesson_service.get_lesson_by_id
+            lesson_service.get_lesson_by_id = lambda lesson_id: reads.append(lesson_id) or read_lesson(lesson_id)
+            missing = [await service.get_lesson_by_id("other-lesson") for _ in range(3)]
+
+            with open(lesson_file, "w", encoding="utf-8") as f:
+                json.dump(dict(sample_lesson_data, id="other-lesson"), f)
+            os.utime(os.path.dirname(lesson_file), ns=(0, 0))
+            changed = await service.refresh_if_changed()
+            return missing, reads, changed, await service.get_lesson_by_id("other-lesson")
+
+        missing, reads, changed, lesson = asyncio.run(main())
+        assert missing == [None, None, None]
+        # Only the refresh read lesson files
+        assert sorted(reads) == ["other-lesson", "test-lesson"]
+        assert changed is True
+        assert lesson["id"] == "other-lesson"
+
+    def test_refresh_after_in_place_edit(self, setup_content_dir, sample_lesson_data):
+        """Test rewriting a lesson file in place reloads the snapshot, as the WSGI API would see it"""
+        service = AsyncLessonService(LessonService(setup_content_dir))
+        lesson_file = os.path.join(setup_content_dir, "lessons", "test-lesson.json")
+
+        async def main():
+            await service.load_snapshot()
+            inode = os.stat(lesson_file).st_ino
+            with open(lesson_file, "w", encoding="utf-8") as f:
+                json.dump(dict(sample_lesson_data, title="Edited Title"), f)
+            assert os.stat(lesson_file).st_ino == inode
+            changed = await service.refresh_if_changed()
+            return changed, await service.get_lesson_by_id("test-lesson")
+
+        changed, lesson = asyncio.run(main())
+        assert changed is True
+        assert lesson["title"] == "Edited Title"
+
+class TestAttemptRecorder:
+    """Test queued attempt recording"""
+
+    def test_record_and_flush(self, attempts_log):
+        """Test attempts are counted and written to the log on stop"""
+        recorder = AttemptRecorder(attempts_log)
+
+        async def main():
+            recorder.start()
+            recorder.record("lesson", "ex-1", True)
+            recorder.record("lesson", "ex-1", False)
+            await recorder.stop()
+
+        asyncio.run(main())
+        assert recorder.stats[("lesson", "ex-1")] == [2, 1]
+        with open(attempts_log, encoding="utf-8") as f:
+            assert len(f.readlines()) == 2
+
+    def test_drops_when_full(self):
+        """Test a full queue drops attempts instead of blocking"""
+        recorder = AttemptRecorder(max_queue=1)
+
+        async def main():
+            recorder.start()
+            recorder.record("lesson", "ex-1", True)
+            recorder.record("lesson", "ex-1", True)
+            await recorder.stop()
+
+        asyncio.run(main())
+        assert recorder.dropped == 1
+
+class TestAsgiEndpoints:
+    """Test the ASGI API endpoints"""
+
+    def test_get_lessons(self, asgi_app):
+        """Test GET /api/lessons"""
+        [(status, data)] = run(asgi_app, ("GET", "/api/lessons"))
+        assert status == 200
+        assert data["success"] is True
+        assert data["data"][0]["id"] == "test-lesson"
+
+    def test_get_lesson(self, asgi_app):
+        """Test GET /api/lessons/<lesson_id> and a missing lesson"""
+        found, missing = run(asgi_app, ("GET", "/api/lessons/test-lesson"), ("GET", "/api/lessons/non-existent"))
+        assert found[0] == 200
+        assert found[1]["data"]["id"] == "test-lesson"
+        assert missing[0] == 404
+        assert missing[1]["success"] is False
+
+    def test_submit_exercise_attempt(self, asgi_app, attempts_log):
+        """Test POST /api/exercises/<exercise_id>/attempt grades and records the attempt"""
+        [(status, data)] = run(asgi_app, ("POST", "/api/exercises/test-ex-1/attempt",
+                                          {"lesson_id": "test-lesson", "answer": "1"}))
+        assert status == 200
+        assert data["data"]["correct"] is False
+        assert data["data"]["correct_answer"] == 0
+        assert asgi_app.recorder.stats[("test-lesson", "test-ex-1")] == [1, 0]
+        assert os.path.exists(attempts_log)
+
+    def test_submit_exercise_attempt_errors(self, asgi_app):
+        """Test attempt validation matches the WSGI API"""
+        results = run(
+            asgi_app,
+            ("POST", "/api/exercises/test-ex-1/attempt", {}),
+            ("POST", "/api/exercises/test-ex-1/attempt", None, None),
+            ("POST", "/api/exercises/non-existent/attempt", {"lesson_id": "test-lesson", "answer": "a"}),
+        )
+        assert [status for status, _ in results] == [400, 400, 400]
+        assert all(data["success"] is False for _, data in results)
+
+    def test_unknown_route_and_method(self, asgi_app):
+        """Test unknown paths and wrong methods"""
+        missing, wrong_method = run(asgi_app, ("GET", "/api/unknown"), ("POST", "/api/lessons"))
+        assert missing[0] == 404
+        assert wrong_method[0] == 405
+
+    def test_cors_preflight(self, asgi_app):
+        """Test a cross-origin preflight for attempts is answered like flask-cors does"""
+        async def main():
+            result = await send_request(asgi_app, "OPTIONS", "/api/exercises/test-ex-1/attempt", headers=[
+                ("Origin", "https://app.example"),
+                ("Access-Control-Request-Method", "POST"),
+                ("Access-Control-Request-Headers", "Content-Type"),
+            ])
+            await asgi_app.shutdown()
+            return result
+
+        status, headers, body = asyncio.run(main())
+        assert status == 200
+        assert body == b""
+        assert headers["access-control-allow-origin"] == "https://app.example"
+        assert headers["vary"] == "Origin"
+        assert "POST" in headers["access-control-allow-methods"]
+        assert headers["access-control-allow-headers"] == "Content-Type"
+        assert headers["allow"] == "POST, OPTIONS"
+
+    def test_cors_headers_on_responses(self, asgi_app):
+        """Test responses echo the Origin, or allow any origin without one"""
+        async def main():
+            results = [
+                await send_request(asgi_app, "GET", "/api/lessons", headers=[("Origin", "https://app.example")]),
+                await send_request(asgi_app, "GET", "/api/lessons"),
+            ]
+            await asgi_app.shutdown()
+            return results
+
+        (_, with_origin, _), (_, without_origin, _) = asyncio.run(main())
+        assert with_origin["access-control-allow-origin"] == "https://app.example"
+        assert with_origin["vary"] == "Origin"
+        assert without_origin["access-control-allow-origin"] == "*"
+        assert "vary" not in without_origin
\ No newline at end of file
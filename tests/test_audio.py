@@ -0,0 +1,139 @@
+import pytest
+import hashlib
+import json
+import os
+import sys
+
+# Add the parent directory to the path to import the app
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app
+from services.audio_service import AudioService
+
+AUDIO_BYTES = b"ID3" + bytes(range(256)) * 4
+
+@pytest.fixture
+def audio_dir(setup_content_dir):
+    """Create an audio directory with the file referenced by the test lesson"""
+    audio_dir = os.path.join(setup_content_dir, "audio")
+    os.makedirs(audio_dir)
+    with open(os.path.join(audio_dir, "test.mp3"), "wb") as f:
+        f.write(AUDIO_BYTES)
+    return audio_dir
+
+@pytest.fixture
+def app(setup_content_dir, audio_dir, monkeypatch):
+    """Create application for testing with custom content and audio directories"""
+    app = create_app()
+    app.config['TESTING'] = True
+
+    with app.app_context():
+        from services.lesson_service import lesson_service
+        from services.audio_service import audio_service
+        lesson_service.content_dir = setup_content_dir
+        lesson_service.lessons_dir = os.path.join(setup_content_dir, "lessons")
+        lesson_service.curriculum_file = os.path.join(setup_content_dir, "curriculum.json")
+        monkeypatch.setattr(audio_service, "audio_dir", audio_dir)
+
+    return app
+
+@pytest.fixture
+def client(app):
+    """Create test client"""
+    return app.test_client()
+
+class TestAudioService:
+    """Test audio file lookup and manifests"""
+
+    def test_get_file_info(self, audio_dir):
+        """Test size and hash of an audio file"""
+        service = AudioService(audio_dir)
+        info = service.get_file_info("test.mp3")
+
+        assert info["size"] == len(AUDIO_BYTES)
+        assert info["sha256"] == hashlib.sha256(AUDIO_BYTES).hexdigest()
+
+    def test_get_file_info_rejects_traversal(self, audio_dir):
+        """Test that paths outside the audio directory are refused"""
+        service = AudioService(audio_dir)
+        assert service.get_file_info("../curriculum.json") is None
+        assert service.get_file_info("missing.mp3") is None
+
+    def test_get_lesson_manifest(self, audio_dir, sample_lesson_data):
+        """Test manifest lists referenced files once and reports missing ones"""
+        lesson = dict(sample_lesson_data)
+        lesson["vocabulary"] = sample_lesson_data["vocabulary"] + [
+            {"chinese": "测试", "audio": "audio/test.mp3"},
+            {"chinese": "没有", "audio": "audio/missing.mp3"},
+        ]
+        manifest = AudioService(audio_dir).get_lesson_manifest(lesson)
+
+        assert manifest["lesson_id"] == "test-lesson"
+        assert [f["filename"] for f in manifest["files"]] == ["test.mp3"]
+        assert manifest["total_size"] == len(AUDIO_BYTES)
+        assert manifest["missing"] == ["audio/missing.mp3"]
+
+class TestAudioEndpoints:
+    """Test the audio API endpoints"""
+
+    def test_get_audio(self, client):
+        """Test GET /api/audio/<filename> without a version must be revalidated"""
+        response = client.get('/api/audio/test.mp3')
+        assert response.status_code == 200
+        assert response.data == AUDIO_BYTES
+        assert response.headers["ETag"] == '"%s"' % hashlib.sha256(AUDIO_BYTES).hexdigest()
+        assert response.headers["Accept-Ranges"] == "bytes"
+        assert "no-cache" in response.headers["Cache-Control"]
+        assert "immutable" not in response.headers["Cache-Control"]
+
+    def test_get_audio_versioned(self, client):
+        """Test GET /api/audio/<filename>?v=<digest> is cached as immutable"""
+        version = hashlib.sha256(AUDIO_BYTES).hexdigest()[:16]
+        response = client.get(f'/api/audio/test.mp3?v={version}')
+        assert response.status_code == 200
+        assert "immutable" in response.headers["Cache-Control"]
+        assert "max-age=31536000" in response.headers["Cache-Control"]
+
+    def test_get_audio_stale_version(self, client):
+        """Test a version that no longer matches the file is not cached as immutable"""
+        response = client.get('/api/audio/test.mp3?v=0000000000000000')
+        assert response.status_code == 200
+        assert "no-cache" in response.headers["Cache-Control"]
+        assert "immutable" not in response.headers["Cache-Control"]
+
+    def test_get_audio_range(self, client):
+        """Test GET /api/audio/<filename> with a Range header"""
+        response = client.get('/api/audio/test.mp3', headers={"Range": "bytes=10-19"})
+        assert response.status_code == 206
+        assert response.data == AUDIO_BYTES[10:20]
+        assert response.headers["Content-Range"] == "bytes 10-19/%d" % len(AUDIO_BYTES)
+
+    def test_get_audio_not_modified(self, client):
+        """Test GET /api/audio/<filename> with a matching If-None-Match"""
+        etag = client.get('/api/audio/test.mp3').headers["ETag"]
+        response = client.get('/api/audio/test.mp3', headers={"If-None-Match": etag})
+        assert response.status_code == 304
+
+    def test_get_audio_not_found(self, client):
+        """Test GET /api/audio/<filename> with a missing file"""
+        response = client.get('/api/audio/missing.mp3')
+        assert response.status_code == 404
+
+    def test_get_audio_manifest(self, client):
+        """Test GET /api/lessons/<lesson_id>/audio-manifest"""
+        response = client.get('/api/lessons/test-lesson/audio-manifest')
+        assert response.status_code == 200
+
+        data = json.loads(response.data)
+        assert data["success"] is True
+        entry = data["data"]["files"][0]
+        assert entry["audio"] == "audio/test.mp3"
+        assert entry["size"] == len(AUDIO_BYTES)
+        assert entry["url"].startswith('/api/audio/test.mp3?v=')
+
+        assert client.get(entry["url"]).data == AUDIO_BYTES
+
+    def test_get_audio_manifest_not_found(self, client):
+        """Test GET /api/lessons/<lesson_id>/audio-manifest with non-existent lesson"""
+        response = client.get('/api/lessons/non-existent/audio-manifest')
+        assert response.status_code == 404
@@ -0,0 +1,240 @@
+import pytest
+import copy
+import json
+import os
+import stat
+import sys
+
+# Add the parent directory to the path to import the app
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app
+from services.ingest_service import IngestService, validate_lesson
+
+@pytest.fixture
+def new_lesson(sample_lesson_data):
+    lesson = copy.deepcopy(sample_lesson_data)
+    lesson["id"] = "new-lesson"
+    lesson["title"] = "New Lesson"
+    for exercise in lesson["exercises"]:
+        exercise["id"] = "new-" + exercise["id"]
+    return lesson
+
+def write_import(tmp_path, lesson, name=None):
+    import_dir = tmp_path / "import"
+    import_dir.mkdir(exist_ok=True)
+    path = import_dir / (name or f"{lesson['id']}.json")
+    path.write_text(json.dumps(lesson, ensure_ascii=False), encoding="utf-8")
+    return str(path)
+
+def read_curriculum(content_dir):
+    with open(os.path.join(content_dir, "curriculum.json"), encoding="utf-8") as f:
+        return json.load(f)
+
+class TestValidateLesson:
+    """Test the lesson schema check"""
+
+    def test_valid_lesson(self, sample_lesson_data):
+        """Test a well formed lesson has no errors"""
+        assert validate_lesson(sample_lesson_data) == []
+
+    def test_missing_fields(self):
+        """Test required lesson fields"""
+        errors = validate_lesson({"id": "bad id"})
+        assert any("id" in e for e in errors)
+        assert any("title" in e for e in errors)
+
+    def test_correct_answer_out_of_range(self, sample_lesson_data):
+        """Test multiple choice correct_answer must index into options"""
+        sample_lesson_data["exercises"][0]["correct_answer"] = 4
+        errors = validate_lesson(sample_lesson_data)
+        assert errors == ["exercise 'test-ex-1' correct_answer must be an index into options"]
+
+    def test_duplicate_exercise_ids(self, sample_lesson_data):
+        """Test exercise ids must be unique within a lesson"""
+        sample_lesson_data["exercises"][1]["id"] = "test-ex-1"
+        errors = validate_lesson(sample_lesson_data)
+        assert errors == ["exercise id 'test-ex-1' is not unique"]
+
+class TestIngestService:
+    """Test bulk validation and ingest"""
+
+    def test_validate(self, setup_content_dir):
+        """Test content that agrees with its curriculum"""
+        report = IngestService(setup_content_dir, workers=2).validate()
+        assert report["errors"] == []
+        assert report["checked"] == 1
+
+    def test_validate_curriculum_mismatch(self, setup_content_dir):
+        """Test curriculum entries that disagree with lesson files"""
+        curriculum = read_curriculum(setup_content_dir)
+        curriculum["lessons"][0]["title"] = "Other Title"
+        curriculum["lessons"].append({"id": "ghost", "title": "Ghost"})
+        with open(os.path.join(setup_content_dir, "curriculum.json"), "w", encoding="utf-8") as f:
+            json.dump(curriculum, f)
+
+        errors = IngestService(setup_content_dir, workers=2).validate()["errors"]
+        assert "curriculum: title of lesson 'test-lesson' does not match its lesson file" in errors
+        assert "curriculum: lesson 'ghost' has no lesson file" in errors
+
+    def test_ingest_lessons(self, tmp_path, setup_content_dir, new_lesson):
+        """Test lessons are written and the curriculum regenerated"""
+        new_lesson["estimated_duration"] = "5 minutes"
+        path = write_import(tmp_path, new_lesson)
+
+        report = IngestService(setup_content_dir, workers=2).ingest([path])
+        assert report["errors"] == []
+        assert report["written"] == ["new-lesson"]
+
+        with open(os.path.join(setup_content_dir, "lessons", "new-lesson.json"), encoding="utf-8") as f:
+            assert json.load(f) == new_lesson
+
+        lessons = read_curriculum(setup_content_dir)["lessons"]
+        assert [lesson["id"] for lesson in lessons] == ["test-lesson", "new-lesson"]
+        assert lessons[0]["estimated_duration"] == "10 minutes"
+        assert lessons[1]["estimated_duration"] == "5 minutes"
+        assert IngestService(setup_content_dir, workers=2).validate()["errors"] == []
+
+    def test_ingest_files_are_readable(self, tmp_path, setup_content_dir, new_lesson):
+        """Test written lessons and curriculum are not left with mkstemp's private mode"""
+        lesson_file = os.path.join(setup_content_dir, "lessons", "new-lesson.json")
+        curriculum_file = os.path.join(setup_content_dir, "curriculum.json")
+        os.chmod(curriculum_file, 0o664)
+
+        IngestService(setup_content_dir, workers=2).ingest([write_import(tmp_path, new_lesson)])
+        assert stat.S_IMODE(os.stat(lesson_file).st_mode) == 0o644
+        assert stat.S_IMODE(os.stat(curriculum_file).st_mode) == 0o664
+
+    def test_ingest_replaces_existing_lesson(self, tmp_path, setup_content_dir, sample_lesson_data):
+        """Test an imported lesson replaces the lesson file with the same id"""
+        sample_lesson_data["title"] = "Updated Title"
+        path = write_import(tmp_path, sample_lesson_data)
+
+        report = IngestService(setup_content_dir, workers=2).ingest([path])
+        assert report["errors"] == []
+        assert read_curriculum(setup_content_dir)["lessons"][0]["title"] == "Updated Title"
+
+    def test_ingest_invalid_writes_nothing(self, tmp_path, setup_content_dir, new_lesson):
+        """Test one invalid lesson stops the whole ingest"""
+        good = write_import(tmp_path, new_lesson)
+        bad_lesson = dict(new_lesson, id="bad-lesson", exercises=[])
+        del bad_lesson["title"]
+        bad = write_import(tmp_path, bad_lesson)
+
+        report = IngestService(setup_content_dir, workers=2).ingest([good, bad])
+        assert report["errors"] == [f"{bad}: title must be a non-empty string"]
+        assert not os.path.exists(os.path.join(setup_content_dir, "lessons", "new-lesson.json"))
+        assert len(read_curriculum(setup_content_dir)["lessons"]) == 1
+
+    def test_ingest_duplicate_exercise_ids_across_lessons(self, tmp_path, setup_content_dir, new_lesson):
+        """Test exercise ids must be unique across lessons"""
+        new_lesson["exercises"][0]["id"] = "test-ex-1"
+        path = write_import(tmp_path, new_lesson)
+
+        errors = IngestService(setup_content_dir, workers=2).ingest([path])["errors"]
+        assert errors == [f"{path}: exercise id 'test-ex-1' is also used by lesson 'test-lesson'"]
+
+    def test_ingest_dry_run(self, tmp_path, setup_content_dir, new_lesson):
+        """Test a dry run validates without writing"""
+        path = write_import(tmp_path, new_lesson)
+
+        report = IngestService(setup_content_dir, workers=2).ingest([path], dry_run=True)
+        assert report["errors"] == []
+        assert not os.path.exists(os.path.join(setup_content_dir, "lessons", "new-lesson.json"))
+
+    def test_ingest_vocabulary_dump(self, tmp_path, setup_content_dir):
+        """Test a TSV vocabulary dump creates new lessons and updates existing ones"""
+        dump = tmp_path / "vocabulary.tsv"
+        dump.write_text(
+            "lesson_id\ttitle\tlevel\tcategory\tchinese\tpinyin\tenglish\taudio\n"
+            "colors\tColors\tbeginner\tbasics\t红\thóng\tRed\taudio/hong.mp3\n"
+            "colors\t\t\t\t蓝\tlán\tBlue\t\n"
+            "test-lesson\t\t\t\t考试\tkǎoshì\tExam\t\n",
+            encoding="utf-8"
+        )
+
+        report = IngestService(setup_content_dir, workers=2).ingest([str(dump)])
+        assert report["errors"] == []
+
+        with open(os.path.join(setup_content_dir, "lessons", "colors.json"), encoding="utf-8") as f:
+            colors = json.load(f)
+        assert colors["title"] == "Colors"
+        assert [w["english"] for w in colors["vocabulary"]] == ["Red", "Blue"]
+        assert colors["vocabulary"][0]["audio"] == "audio/hong.mp3"
+
+        with open(os.path.join(setup_content_dir, "lessons", "test-lesson.json"), encoding="utf-8") as f:
+            updated = json.load(f)
+        assert [w["english"] for w in updated["vocabulary"]] == ["Exam"]
+        assert len(updated["exercises"]) == 2
+
+    def test_ingest_vocabulary_dump_short_rows(self, tmp_path, setup_content_dir):
+        """Test rows with missing or empty cells are reported with their line number"""
+        dump = tmp_path / "vocabulary.csv"
+        dump.write_text(
+            "lesson_id,chinese,pinyin,english\n"
+            "test-lesson,红\n"
+            "test-lesson,蓝,lán,\n"
+            "test-lesson,绿,lǜ,Green\n",
+            encoding="utf-8"
+        )
+
+        report = IngestService(setup_content_dir, workers=2).ingest([str(dump)])
+        assert report["errors"] == [
+            f"{dump}:2: missing pinyin, english",
+            f"{dump}:3: missing english",
+        ]
+        with open(os.path.join(setup_content_dir, "lessons", "test-lesson.json"), encoding="utf-8") as f:
+            assert json.load(f)["vocabulary"][0]["english"] == "Test"
+
+    def test_ingest_vocabulary_dump_bad_lesson_id(self, tmp_path, setup_content_dir):
+        """Test a path-like lesson_id is reported before any lesson file is read"""
+        dump = tmp_path / "vocabulary.csv"
+        dump.write_text(
+            "lesson_id,chinese,pinyin,english\n"
+            "../lessons/test-lesson,红,hóng,Red\n",
+            encoding="utf-8"
+        )
+
+        report = IngestService(setup_content_dir, workers=2).ingest([str(dump)], dry_run=True)
+        assert report["errors"] == [
+            f"{dump}:2: lesson_id '../lessons/test-lesson' must contain only letters, digits, '-' or '_'"
+        ]
+
+    def test_ingest_vocabulary_dump_mismatched_lesson_file(self, tmp_path, setup_content_dir, sample_lesson_data):
+        """Test an existing lesson file whose id differs from its file name is not used as the base"""
+        with open(os.path.join(setup_content_dir, "lessons", "other.json"), "w", encoding="utf-8") as f:
+            json.dump(sample_lesson_data, f)
+        dump = tmp_path / "vocabulary.csv"
+        dump.write_text("lesson_id,chinese,pinyin,english\nother,红,hóng,Red\n", encoding="utf-8")
+
+        report = IngestService(setup_content_dir, workers=2).ingest([str(dump)], dry_run=True)
+        assert report["errors"][0] == (
+            f"{dump}:2: existing lesson file {os.path.join(setup_content_dir, 'lessons', 'other.json')} "
+            "does not have id 'other'"
+        )
+
+    def test_ingest_vocabulary_dump_missing_columns(self, tmp_path, setup_content_dir):
+        """Test a dump without the required columns is rejected"""
+        dump = tmp_path / "vocabulary.csv"
+        dump.write_text("lesson_id,chinese\nx,红\n", encoding="utf-8")
+
+        report = IngestService(setup_content_dir, workers=2).ingest([str(dump)])
+        assert len(report["errors"]) == 1
+        assert "missing columns pinyin, english" in report["errors"][0]
+
+class TestContentCommands:
+    """Test the flask content CLI commands"""
+
+    def test_validate_command(self, setup_content_dir):
+        runner = create_app().test_cli_runner()
+        result = runner.invoke(args=["content", "validate", "--content-dir", setup_content_dir])
+        assert result.exit_code == 0
+        assert "0 error(s)" in result.output
+
+    def test_ingest_command_invalid(self, tmp_path, setup_content_dir, new_lesson):
+        new_lesson["exercises"][0]["correct_answer"] = 10
+        path = write_import(tmp_path, new_lesson)
+
+        runner = create_app().test_cli_runner()
+        result = runner.invoke(args=["content", "ingest", "--content-dir", setup_content_dir, path])
+        assert result.exit_code == 1
@@ -48,6 +48,20 @@ class TestLessonService:
         
         assert lesson is None
     
+    def test_get_lesson_by_id_cached(self, setup_content_dir):
+        """Test a lesson is parsed once and reloaded when its file is replaced"""
+        service = LessonService(setup_content_dir)
+        lesson = service.get_lesson_by_id("test-lesson")
+        assert service.get_lesson_by_id("test-lesson") is lesson
+        
+        lesson_file = os.path.join(setup_content_dir, "lessons", "test-lesson.json")
+        replacement = lesson_file + ".new"
+        with open(replacement, "w", encoding="utf-8") as f:
+            json.dump(dict(lesson, title="Replaced"), f)
+        os.replace(replacement, lesson_file)
+        
+        assert service.get_lesson_by_id("test-lesson")["title"] == "Replaced"
+    
     def test_get_exercise_by_id(self, setup_content_dir):
         """Test getting a specific exercise"""
         service = LessonService(setup_content_dir)
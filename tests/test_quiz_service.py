@@ -0,0 +1,240 @@
+import pytest
+import json
+import os
+import sys
+import threading
+
+# Add the parent directory to the path to import the app
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app
+from services.lesson_service import LessonService
+from services.quiz_service import QuizService
+from services.admission import admission_controller, EndpointLimits
+
+WORDS = [
+    ("一", "yī", "One"), ("二", "èr", "Two"), ("三", "sān", "Three"),
+    ("四", "sì", "Four"), ("五", "wǔ", "Five"), ("六", "liù", "Six"),
+]
+
+@pytest.fixture
+def quiz_content_dir(setup_content_dir):
+    """Add a second beginner lesson with enough vocabulary for quizzes"""
+    lesson = {
+        "id": "numbers",
+        "title": "Numbers",
+        "level": "beginner",
+        "category": "basics",
+        "vocabulary": [
+            {"chinese": c, "pinyin": p, "english": e, "audio": f"audio/{p}.mp3"} for c, p, e in WORDS
+        ],
+        "grammar": [],
+        "exercises": []
+    }
+    with open(os.path.join(setup_content_dir, "lessons", "numbers.json"), "w", encoding="utf-8") as f:
+        json.dump(lesson, f, ensure_ascii=False)
+
+    curriculum_file = os.path.join(setup_content_dir, "curriculum.json")
+    with open(curriculum_file, encoding="utf-8") as f:
+        curriculum = json.load(f)
+    curriculum["lessons"].append({"id": "numbers", "title": "Numbers", "level": "beginner", "category": "basics"})
+    with open(curriculum_file, "w", encoding="utf-8") as f:
+        json.dump(curriculum, f, ensure_ascii=False)
+
+    return setup_content_dir
+
+@pytest.fixture
+def quiz_service(quiz_content_dir):
+    return QuizService(LessonService(quiz_content_dir))
+
+def grade(service, quiz, exercise, answer):
+    return service.validate_quiz_answer(quiz["token"], exercise["id"], answer)
+
+class TestQuizService:
+    """Test quiz generation and grading"""
+
+    def test_pools(self, quiz_service):
+        """Test per-level and per-category pools are built from all lessons"""
+        pool = quiz_service.get_pool()
+
+        assert len(pool.get_pool("beginner")) == len(WORDS) + 1
+        assert len(pool.get_pool("beginner", "basics")) == len(WORDS)
+        assert len(pool.get_pool("beginner", "test")) == 1
+        assert len(pool.get_pool("advanced")) == 0
+
+    def test_generate_quiz(self, quiz_service):
+        """Test generated questions use the multiple choice shape with distinct options"""
+        quiz = quiz_service.generate_quiz("beginner", 20)
+
+        assert quiz["valid"] is True
+        assert len(quiz["exercises"]) == 20
+        for exercise in quiz["exercises"]:
+            assert exercise["type"] == "multiple_choice"
+            assert len(exercise["options"]) == 4
+            assert len(set(exercise["options"])) == 4
+            assert "correct_answer" not in exercise
+
+    def test_generate_quiz_category(self, quiz_service):
+        """Test distractors come from the requested category only"""
+        quiz = quiz_service.generate_quiz("beginner", 5, category="basics")
+        english = {e for _, _, e in WORDS}
+
+        for exercise in quiz["exercises"]:
+            assert set(exercise["options"]) <= english
+
+    def test_questions_unique_when_pool_allows(self, quiz_service):
+        """Test words are not repeated when the pool is large enough"""
+        quiz = quiz_service.generate_quiz("beginner", len(WORDS), category="basics")
+        questions = [exercise["question"] for exercise in quiz["exercises"]]
+
+        assert len(set(questions)) == len(WORDS)
+
+    def test_generate_quiz_invalid(self, quiz_service):
+        """Test requests that cannot produce a quiz"""
+        assert quiz_service.generate_quiz("advanced", 5)["valid"] is False
+        assert quiz_service.generate_quiz("beginner", 0)["valid"] is False
+        assert quiz_service.generate_quiz("beginner", 1000)["valid"] is False
+
+    def test_validate_quiz_answer(self, quiz_service):
+        """Test grading regenerates the quiz from its token"""
+        quiz = quiz_service.generate_quiz("beginner", 10)
+
+        for exercise in quiz["exercises"]:
+            chinese = exercise["question"].split()[2]
+            expected = next(e for c, _, e in WORDS + [("测试", "", "Test")] if c == chinese)
+            answer = exercise["options"].index(expected)
+
+            result = grade(quiz_service, quiz, exercise, str(answer))
+            assert result["valid"] is True
+            assert result["correct"] is True
+            assert result["correct_answer"] == answer
+
+            result = grade(quiz_service, quiz, exercise, (answer + 1) % 4)
+            assert result["correct"] is False
+
+    def test_pool_rebuilt_when_lesson_edited(self, quiz_content_dir):
+        """Test editing a lesson's vocabulary in place rebuilds the pool and expires old tokens"""
+        service = QuizService(LessonService(quiz_content_dir), check_interval=0)
+        quiz = service.generate_quiz("beginner", 1)
+        version = service.get_pool().version
+
+        lesson_file = os.path.join(quiz_content_dir, "lessons", "numbers.json")
+        with open(lesson_file, encoding="utf-8") as f:
+            lesson = json.load(f)
+        lesson["vocabulary"].append({"chinese": "七", "pinyin": "qī", "english": "Seven"})
+        with open(lesson_file, "w", encoding="utf-8") as f:
+            json.dump(lesson, f, ensure_ascii=False)
+        stat = os.stat(lesson_file)
+        os.utime(lesson_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+        assert service.get_pool().version != version
+        assert len(service.get_pool().get_pool("beginner", "basics")) == len(WORDS) + 1
+        assert service.validate_quiz_answer(quiz["token"], "quiz-1", "0")["valid"] is False
+
+    def test_rebuild_does_not_block_other_requests(self, quiz_content_dir):
+        """Test requests keep using the current pool while another request rebuilds it"""
+        service = QuizService(LessonService(quiz_content_dir), check_interval=0)
+        old_pool = service.get_pool()
+
+        curriculum_file = os.path.join(quiz_content_dir, "curriculum.json")
+        stat = os.stat(curriculum_file)
+        os.utime(curriculum_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+        building, finish = threading.Event(), threading.Event()
+        build_pool = service._build_pool
+
+        def slow_build_pool():
+            building.set()
+            finish.wait(5)
+            return build_pool()
+
+        service._build_pool = slow_build_pool
+        refresher = threading.Thread(target=service.get_pool)
+        refresher.start()
+        try:
+            assert building.wait(5)
+            assert service.get_pool() is old_pool
+        finally:
+            finish.set()
+            refresher.join()
+        assert service.get_pool() is not old_pool
+
+    def test_validate_quiz_answer_invalid_token(self, quiz_service):
+        """Test tampered tokens are rejected"""
+        quiz = quiz_service.generate_quiz("beginner", 1)
+        result = quiz_service.validate_quiz_answer(quiz["token"] + "x", "quiz-1", "0")
+
+        assert result["valid"] is False
+
+    def test_validate_quiz_answer_not_found(self, quiz_service):
+        """Test answering a question the quiz does not have"""
+        quiz = quiz_service.generate_quiz("beginner", 1)
+        result = quiz_service.validate_quiz_answer(quiz["token"], "quiz-2", "0")
+
+        assert result["valid"] is False
+
+class TestQuizEndpoints:
+    """Test the quiz API endpoints"""
+
+    @pytest.fixture
+    def client(self, quiz_content_dir):
+        app = create_app()
+        app.config['TESTING'] = True
+
+        with app.app_context():
+            from services.lesson_service import lesson_service
+            lesson_service.content_dir = quiz_content_dir
+            lesson_service.lessons_dir = os.path.join(quiz_content_dir, "lessons")
+            lesson_service.curriculum_file = os.path.join(quiz_content_dir, "curriculum.json")
+
+        return app.test_client()
+
+    def test_get_quiz_and_attempt(self, client):
+        """Test GET /api/quiz followed by POST /api/quiz/<token>/attempt"""
+        response = client.get('/api/quiz?level=beginner&n=5')
+        assert response.status_code == 200
+
+        data = json.loads(response.data)["data"]
+        assert len(data["exercises"]) == 5
+
+        response = client.post(f'/api/quiz/{data["token"]}/attempt',
+                               data=json.dumps({
+                                   'exercise_id': data["exercises"][0]["id"],
+                                   'answer': '0'
+                               }),
+                               content_type='application/json')
+        assert response.status_code == 200
+
+        result = json.loads(response.data)
+        assert result["success"] is True
+        assert result["data"]["correct"] is (result["data"]["correct_answer"] == 0)
+
+    def test_get_quiz_missing_level(self, client):
+        """Test GET /api/quiz without a level"""
+        response = client.get('/api/quiz?n=5')
+        assert response.status_code == 400
+
+    def test_quiz_attempt_missing_data(self, client):
+        """Test POST /api/quiz/<token>/attempt with missing data"""
+        response = client.post('/api/quiz/token/attempt',
+                               data=json.dumps({}),
+                               content_type='application/json')
+        assert response.status_code == 400
+
+    def test_quiz_attempt_uses_grading_limits(self, client, monkeypatch):
+        """Test quiz grading is rate limited with the grading limits"""
+        limits = EndpointLimits(4, 4, 1.0, rate_per_client=0.1, burst_per_client=1)
+        monkeypatch.setitem(admission_controller.limits, "api.submit_quiz_attempt", limits)
+        assert admission_controller.limits_for("api.submit_quiz_attempt") is limits
+
+        data = json.loads(client.get('/api/quiz?level=beginner&n=1').data)["data"]
+        attempt = json.dumps({'exercise_id': 'quiz-1', 'answer': '0'})
+        assert client.post(f'/api/quiz/{data["token"]}/attempt', data=attempt,
+                           content_type='application/json').status_code == 200
+        assert client.post(f'/api/quiz/{data["token"]}/attempt', data=attempt,
+                           content_type='application/json').status_code == 429
+
+    def test_quiz_attempt_shares_grading_pool(self):
+        """Test quiz and exercise grading are configured with the same limits"""
+        assert (admission_controller.limits["api.submit_quiz_attempt"]
+                is admission_controller.limits["api.submit_exercise_attempt"])
@@ -0,0 +1,106 @@
+import pytest
+import os
+import sys
+
+# Add the parent directory to the path to import the app
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app
+from benchmark_startup import parse_importtime, run_startup_benchmark
+from services.startup import StartupTimer, warm_up
+
+@pytest.fixture
+def content_dir(setup_content_dir, monkeypatch):
+    """Point the global lesson service at the test content"""
+    from services.lesson_service import lesson_service
+    monkeypatch.setattr(lesson_service, "content_dir", setup_content_dir)
+    monkeypatch.setattr(lesson_service, "lessons_dir", os.path.join(setup_content_dir, "lessons"))
+    monkeypatch.setattr(lesson_service, "curriculum_file", os.path.join(setup_content_dir, "curriculum.json"))
+    return setup_content_dir
+
+class TestStartupTimer:
+    """Test startup phase timing"""
+
+    def test_phases(self):
+        """Test phases are recorded in order and summarized"""
+        timer = StartupTimer()
+        with timer.phase("first"):
+            pass
+        with timer.phase("second"):
+            pass
+
+        assert [name for name, _ in timer.phases] == ["first", "second"]
+        assert timer.summary().startswith("Startup took ")
+        assert "first" in timer.summary()
+
+    def test_create_app_records_phases(self, content_dir):
+        """Test create_app times imports, blueprint registration and warmup"""
+        app = create_app(warmup="eager-curriculum")
+        names = [name for name, _ in app.extensions["startup_timer"].phases]
+
+        assert names == ["import learning", "import api", "register blueprints", "warmup (eager-curriculum)"]
+
+    def test_create_app_logs_summary(self, content_dir, caplog):
+        """Test the startup summary is logged outside debug mode"""
+        app = create_app()
+
+        assert not app.debug
+        assert any(record.getMessage().startswith("Startup took ") for record in caplog.records)
+
+class TestWarmUp:
+    """Test warmup strategies"""
+
+    def test_unknown_strategy(self):
+        """Test an unknown strategy is rejected"""
+        with pytest.raises(ValueError):
+            warm_up("sometimes")
+
+    def test_eager_curriculum_fills_cache(self, content_dir):
+        """Test eager-curriculum leaves the parsed curriculum in the lesson service cache"""
+        from services.lesson_service import lesson_service
+        warm_up("eager-curriculum")
+
+        assert os.path.join(content_dir, "curriculum.json") in lesson_service._cache
+        assert os.path.join(content_dir, "lessons", "test-lesson.json") not in lesson_service._cache
+
+    def test_eager_everything_builds_quiz_pool(self, content_dir):
+        """Test eager-everything caches every lesson and precomputes the quiz vocabulary pool"""
+        from services.lesson_service import lesson_service
+        from services.quiz_service import quiz_service
+        warm_up("eager-everything")
+
+        assert os.path.join(content_dir, "lessons", "test-lesson.json") in lesson_service._cache
+        assert quiz_service._pool_key[0] == os.path.join(content_dir, "curriculum.json")
+
+class TestStartupReport:
+    """Test the startup report"""
+
+    def test_parse_importtime(self):
+        """Test importtime output is parsed and sorted by cumulative time"""
+        output = (
+            "import time: self [us] | cumulative | imported package\n"
+            "import time:       100 |        100 |   config\n"
+            "import time:       200 |       5000 | app\n"
+        )
+        assert parse_importtime(output) == [("app", 5000), ("config", 100)]
+
+    def test_run_startup_benchmark(self):
+        """Test a strategy is measured in a fresh process"""
+        report = run_startup_benchmark(["lazy"], ["/api/lessons"], runs=1)
+        result = report["strategies"]["lazy"]
+
+        assert result["requests"][0]["status"] == 200
+        assert result["requests"][0]["time_to_response_ms"] > result["requests"][0]["request_ms"]
+        assert any(name == "app" for name, _ in report["imports"])
+
+    def test_timing_runs_without_importtime(self, monkeypatch):
+        """Test only the separate import run uses -X importtime"""
+        import benchmark_startup
+        calls = []
+        run_child = benchmark_startup._run_child
+        monkeypatch.setattr(benchmark_startup, "_run_child",
+                            lambda *args, **kwargs: calls.append(kwargs.get("importtime", False))
+                            or run_child(*args, **kwargs))
+
+        run_startup_benchmark(["lazy"], ["/api/lessons"], runs=2)
+        assert calls == [False, False, True]